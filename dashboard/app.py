@@ -29,7 +29,7 @@ from dashboard.components.chart import create_chart
 from dashboard.components.pattern_description import render_pattern_card
 from dashboard.components.alert_feed import render_alert_feed
 from dashboard.utils.indicators import compute_all, get_current_indicators
-from src.data.fetcher import fetch_asset_data
+from src.data.fetcher import DEFAULT_EXCHANGE, fetch_asset_data
 from src.storage import supabase_client as db
 
 PATTERN_NAMES_CZ = {
@@ -240,7 +240,7 @@ def main():
 
     meta = st.session_state.get("_asset_meta", {})
     asset_type = meta.get("type", "crypto")
-    exchange = meta.get("exchange", "kucoin")
+    exchange = meta.get("exchange", DEFAULT_EXCHANGE)
     czk_conversion = meta.get("czk_conversion", False)
     base_symbol = meta.get("base_symbol")
 
@@ -7,6 +7,8 @@ from typing import Optional
 import yaml
 import streamlit as st
 
+from src.data.fetcher import DEFAULT_EXCHANGE
+
 
 def _load_config() -> dict:
     try:
@@ -39,7 +41,7 @@ def render_sidebar() -> tuple[str, str, int, list[str]]:
         asset_list.append(sym)
         asset_meta[sym] = {
             "type": "crypto",
-            "exchange": item.get("exchange", "kucoin"),
+            "exchange": item.get("exchange", DEFAULT_EXCHANGE),
             "timeframes": item.get("timeframes", ["1h", "4h", "1d"]),
             "czk_conversion": item.get("czk_conversion", False),
             "base_symbol": item.get("base_symbol"),
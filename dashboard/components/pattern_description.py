@@ -183,6 +183,9 @@ def render_pattern_card(alert: dict, current_indicators: dict) -> None:
         alert: Supabase alert record dict
         current_indicators: dict from indicators.get_current_indicators()
     """
+    # Widget calls bound once – avoids repeated attribute lookups on the st module
+    md, columns, divider, warning = st.markdown, st.columns, st.divider, st.warning
+
     if not alert:
         st.info("Žádný nedávný pattern k zobrazení.")
         return
@@ -204,8 +207,8 @@ def render_pattern_card(alert: dict, current_indicators: dict) -> None:
     pattern_name = PATTERN_NAMES_CZ.get(pattern, pattern)
 
     # ---- Header ----
-    st.markdown(f"### {emoji} {pattern_name} – {type_label}")
-    col1, col2, col3 = st.columns([2, 1, 1])
+    md(f"### {emoji} {pattern_name} – {type_label}")
+    col1, col2, col3 = columns([2, 1, 1])
     with col1:
         st.progress(int(confidence), text=f"Confidence: {confidence:.0f} %")
     with col2:
@@ -213,20 +216,20 @@ def render_pattern_card(alert: dict, current_indicators: dict) -> None:
     with col3:
         st.caption(f"⏰ {detected_at} UTC")
 
-    st.divider()
+    divider()
 
     # ---- What is this pattern ----
     explanation = (
         PATTERN_EXPLANATIONS.get(pattern, {}).get(signal_type)
         or "Detekován technický vzor."
     )
-    st.markdown("#### 📖 Co je tento pattern")
-    st.markdown(explanation)
+    md("#### 📖 Co je tento pattern")
+    md(explanation)
 
-    st.divider()
+    divider()
 
     # ---- Trade setup ----
-    st.markdown("#### 🎯 Možný postup")
+    md("#### 🎯 Možný postup")
 
     support = levels.get("support")
     resistance = levels.get("resistance")
@@ -238,14 +241,14 @@ def render_pattern_card(alert: dict, current_indicators: dict) -> None:
         tp1 = entry + (entry - sl) * 3.0 if entry and sl else None
         tp2 = entry + (entry - sl) * 5.0 if entry and sl else None
 
-        cols = st.columns(2)
+        cols = columns(2)
         with cols[0]:
-            st.markdown(f"**Možný vstup (Long):** {_fmt_price(entry, asset)}")
-            st.markdown(f"**Stop Loss:** {_fmt_price(sl, asset)}")
-            st.markdown(f"**Take Profit 1:** {_fmt_price(tp1, asset)}")
-            st.markdown(f"**Take Profit 2:** {_fmt_price(tp2, asset)}")
+            md(f"**Možný vstup (Long):** {_fmt_price(entry, asset)}")
+            md(f"**Stop Loss:** {_fmt_price(sl, asset)}")
+            md(f"**Take Profit 1:** {_fmt_price(tp1, asset)}")
+            md(f"**Take Profit 2:** {_fmt_price(tp2, asset)}")
         with cols[1]:
-            st.markdown(f"**Risk/Reward:** {_compute_rr(entry, sl, tp1)}")
+            md(f"**Risk/Reward:** {_compute_rr(entry, sl, tp1)}")
             rsi_val = current_indicators.get("rsi")
             rsi_hint = ""
             if rsi_val:
@@ -255,8 +258,8 @@ def render_pattern_card(alert: dict, current_indicators: dict) -> None:
                     rsi_hint = "RSI překoupen – opatrnost, možná korekce"
                 else:
                     rsi_hint = "RSI neutrální"
-            st.markdown(f"**Potvrzení signálu:** Čekej na průraz {_fmt_price(resistance or neckline, asset)} "
-                        f"s objemem > 1.5× průměr. {rsi_hint}")
+            md(f"**Potvrzení signálu:** Čekej na průraz {_fmt_price(resistance or neckline, asset)} "
+               f"s objemem > 1.5× průměr. {rsi_hint}")
 
     else:  # bearish
         entry = support or neckline or price
@@ -264,14 +267,14 @@ def render_pattern_card(alert: dict, current_indicators: dict) -> None:
         tp1 = entry - (sl - entry) * 3.0 if entry and sl else None
         tp2 = entry - (sl - entry) * 5.0 if entry and sl else None
 
-        cols = st.columns(2)
+        cols = columns(2)
         with cols[0]:
-            st.markdown(f"**Možný vstup (Short):** {_fmt_price(entry, asset)}")
-            st.markdown(f"**Stop Loss:** {_fmt_price(sl, asset)}")
-            st.markdown(f"**Take Profit 1:** {_fmt_price(tp1, asset)}")
-            st.markdown(f"**Take Profit 2:** {_fmt_price(tp2, asset)}")
+            md(f"**Možný vstup (Short):** {_fmt_price(entry, asset)}")
+            md(f"**Stop Loss:** {_fmt_price(sl, asset)}")
+            md(f"**Take Profit 1:** {_fmt_price(tp1, asset)}")
+            md(f"**Take Profit 2:** {_fmt_price(tp2, asset)}")
         with cols[1]:
-            st.markdown(f"**Risk/Reward:** {_compute_rr(entry, sl, tp1)}")
+            md(f"**Risk/Reward:** {_compute_rr(entry, sl, tp1)}")
             rsi_val = current_indicators.get("rsi")
             rsi_hint = ""
             if rsi_val:
@@ -281,15 +284,15 @@ def render_pattern_card(alert: dict, current_indicators: dict) -> None:
                     rsi_hint = "RSI přeprodán – opatrnost, možný odraz"
                 else:
                     rsi_hint = "RSI neutrální"
-            st.markdown(f"**Potvrzení signálu:** Čekej na průraz {_fmt_price(support or neckline, asset)} "
-                        f"s objemem > 1.5× průměr. {rsi_hint}")
+            md(f"**Potvrzení signálu:** Čekej na průraz {_fmt_price(support or neckline, asset)} "
+               f"s objemem > 1.5× průměr. {rsi_hint}")
 
-    st.warning(DISCLAIMER)
+    warning(DISCLAIMER)
 
-    st.divider()
+    divider()
 
     # ---- Indicator values table ----
-    st.markdown("#### 📊 Technické indikátory v době detekce")
+    md("#### 📊 Technické indikátory v době detekce")
 
     ind_rows = []
     if current_indicators.get("rsi") is not None:
@@ -29,7 +29,9 @@ def add_rsi(df: pd.DataFrame, period: int = 14, col: str = "close") -> pd.Series
     gain = delta.clip(lower=0).rolling(period).mean()
     loss = (-delta.clip(upper=0)).rolling(period).mean()
     rs = gain / loss.replace(0, np.nan)
-    return 100 - (100 / (1 + rs))
+    rsi = 100 - (100 / (1 + rs))
+    # Window without losses = 100 (flat window stays NaN), as in the RSI divergence detector
+    return rsi.mask((loss == 0) & (gain > 0), 100.0)
 
 
 def add_macd(
@@ -48,23 +50,40 @@ def add_macd(
     return macd, signal_line, histogram
 
 
+# Minimum candles each indicator needs before it produces a meaningful value.
+# Indicators whose warmup exceeds the available data are skipped entirely.
+_WARMUP = {
+    "ema20": 20,
+    "ema50": 50,
+    "ema200": 200,
+    "bbands": 20,
+    "rsi": 15,
+    "macd": 35,
+}
+
+
 def compute_all(df: pd.DataFrame) -> dict:
     """
     Compute all indicators and return as a dict of Series.
     Used by the dashboard to add indicator traces to the chart.
+    Indicators without enough candles for their warmup are omitted.
     """
-    if df is None or df.empty or len(df) < 20:
+    if df is None or df.empty or len(df) < min(_WARMUP.values()):
         return {}
 
+    n = len(df)
     result = {}
 
     try:
-        result["ema20"] = add_ema(df, 20)
-        result["ema50"] = add_ema(df, 50)
-        result["ema200"] = add_ema(df, 200)
-        result["bb_upper"], result["bb_mid"], result["bb_lower"] = add_bollinger_bands(df)
-        result["rsi"] = add_rsi(df)
-        result["macd"], result["macd_signal"], result["macd_hist"] = add_macd(df)
+        for period in (20, 50, 200):
+            if n >= _WARMUP[f"ema{period}"]:
+                result[f"ema{period}"] = add_ema(df, period)
+        if n >= _WARMUP["bbands"]:
+            result["bb_upper"], result["bb_mid"], result["bb_lower"] = add_bollinger_bands(df)
+        if n >= _WARMUP["rsi"]:
+            result["rsi"] = add_rsi(df)
+        if n >= _WARMUP["macd"]:
+            result["macd"], result["macd_signal"], result["macd_hist"] = add_macd(df)
     except Exception:
         pass
 
@@ -3,7 +3,7 @@ Market Scanner – main orchestration script.
 
 Runs every 30 minutes via GitHub Actions cron job.
 For each configured asset + timeframe combination:
-  1. Fetch OHLCV data
+  1. Fetch OHLCV data (all assets concurrently, before detection starts)
   2. Run all enabled pattern detectors
   3. If confidence > min_confidence AND R/R >= min_rr and not duplicate: save alert + send Telegram message
 
@@ -17,6 +17,9 @@ Conflict resolution (bullish vs bearish coexisting):
 import logging
 import sys
 import yaml
+import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -31,8 +34,9 @@ from src.patterns.engulfing import EngulfingPattern
 from src.patterns.support_resistance import SupportResistancePattern
 from src.patterns.ichimoku import IchimokuPattern
 from src.patterns.abc_correction import ABCCorrectionPattern
+from src.patterns.base import BasePattern, ExtremaCache, PatternResult
 
-from src.data.fetcher import fetch_asset_data
+from src.data.fetcher import DEFAULT_EXCHANGE, fetch_asset_data, fetch_many_threaded, fetch_stocks_batch
 from src.storage import supabase_client as db
 from src.notifier.telegram import send_alert
 
@@ -84,6 +88,21 @@ PATTERN_WEIGHTS: dict[str, int] = {
 }
 
 
+# Detectors are independent and numpy-heavy → run them concurrently per asset
+DETECT_WORKERS = 4
+
+# Detection cache: (pattern, symbol, timeframe, frame digest) → PatternResult.
+# The digest covers every candle of the frame (see _frame_key), so a re-scan only
+# reuses results when the data is identical – a moved close on the still-forming
+# candle or a restated earlier bar re-runs the detectors.
+DETECT_CACHE_SIZE = 4096
+_detect_cache: "OrderedDict[tuple, PatternResult]" = OrderedDict()
+
+# Patterns with a batched kernel (BasePattern.detect_many) – evaluated for all
+# fetched frames at once before the per-asset loop, results go to _detect_cache
+BATCH_PATTERNS = ("abc_correction", "engulfing")
+
+
 def load_config(path: str = "config.yaml") -> dict:
     with open(path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
@@ -129,6 +148,23 @@ def _compute_rr(signal_type: str, details: dict, current_price: float) -> Option
     return _compute_trade_levels(signal_type, details, current_price)["rr"]
 
 
+def _frame_key(symbol: str, timeframe: str, df: pd.DataFrame) -> tuple:
+    """Detection cache key of a frame: symbol, timeframe and a digest of all its candles."""
+    digest = hash((df.index.asi8.tobytes(), df.to_numpy(dtype="float64").tobytes()))
+    return symbol, timeframe, len(df), digest
+
+
+def _safe_detect(
+    pattern_name: str, detector: BasePattern, df, extrema: Optional[ExtremaCache] = None
+) -> tuple[str, Optional[PatternResult]]:
+    """Run one detector, returning (pattern_name, result or None on failure)."""
+    try:
+        return pattern_name, detector.detect(df, extrema)
+    except Exception as exc:
+        logger.error("  Pattern %s raised exception: %s", pattern_name, exc)
+        return pattern_name, None
+
+
 def scan_asset(
     symbol: str,
     timeframe: str,
@@ -140,10 +176,15 @@ def scan_asset(
     cooldown_hours: int,
     czk_conversion: bool = False,
     base_symbol: Optional[str] = None,
+    df: Optional[pd.DataFrame] = None,
+    dup_cache: Optional[set] = None,
 ) -> list[dict]:
     """
     Fetch data for one asset/timeframe and run all enabled patterns.
     Returns list of alert dicts that passed threshold and dedup check.
+    If `df` is given (prefetched by run_scan), no fetch is performed.
+    If `dup_cache` is given (db.prime_duplicate_cache), the dedup check is a set
+    lookup instead of a query; alerts saved here are added to it.
 
     Conflict filter: if any two patterns on the same asset/timeframe give
     opposite signals (one bullish, one bearish), NO alert is sent for either.
@@ -152,11 +193,12 @@ def scan_asset(
     results = []
 
     logger.info("Scanning %s (%s) on %s", symbol, asset_type, timeframe)
-    df = fetch_asset_data(
-        symbol, timeframe, asset_type, exchange,
-        czk_conversion=czk_conversion,
-        base_symbol=base_symbol,
-    )
+    if df is None:
+        df = fetch_asset_data(
+            symbol, timeframe, asset_type, exchange,
+            czk_conversion=czk_conversion,
+            base_symbol=base_symbol,
+        )
 
     if df is None or df.empty:
         logger.warning("No data for %s %s – skipping", symbol, timeframe)
@@ -170,6 +212,7 @@ def scan_asset(
     # -----------------------------------------------------------------------
     candidates: list[dict] = []  # patterns that passed all individual filters
 
+    active: list[tuple[str, BasePattern]] = []
     for pattern_name in enabled_patterns:
         detector = ALL_PATTERNS.get(pattern_name)
         if detector is None:
@@ -179,13 +222,40 @@ def scan_asset(
         if not detector.supports_timeframe(timeframe):
             continue
 
-        try:
-            result = detector.detect(df)
-        except Exception as exc:
-            logger.error("  Pattern %s raised exception: %s", pattern_name, exc)
-            continue
-
-        if not result.found:
+        active.append((pattern_name, detector))
+
+    # Reuse results for patterns already evaluated on this exact frame
+    candle_key = _frame_key(symbol, timeframe, df)
+    cached: dict[str, PatternResult] = {}
+    pending: list[tuple[str, BasePattern]] = []
+    for name, detector in active:
+        hit = _detect_cache.get((name,) + candle_key)
+        if hit is not None:
+            _detect_cache.move_to_end((name,) + candle_key)
+            cached[name] = hit
+        else:
+            pending.append((name, detector))
+
+    # Extrema of the full frame are computed once and shared by all detectors
+    extrema = ExtremaCache.from_df(df)
+
+    # Detection runs in parallel; thresholds / DB / Telegram stay serial below
+    with ThreadPoolExecutor(max_workers=DETECT_WORKERS) as pool:
+        futures = [
+            pool.submit(_safe_detect, name, detector, df, extrema) for name, detector in pending
+        ]
+        fresh = dict(f.result() for f in futures)
+
+    for name, result in fresh.items():
+        if result is not None:
+            _detect_cache[(name,) + candle_key] = result
+    while len(_detect_cache) > DETECT_CACHE_SIZE:
+        _detect_cache.popitem(last=False)
+
+    detections = [(name, cached[name] if name in cached else fresh.get(name)) for name, _ in active]
+
+    for pattern_name, result in detections:
+        if result is None or not result.found:
             continue
 
         logger.info(
@@ -193,6 +263,8 @@ def scan_asset(
             pattern_name, symbol, result.type, result.confidence,
         )
 
+        # Rounded once here; the alert path below works on a copy of it
+        details = result.rounded_details()
         results.append({
             "asset": symbol,
             "timeframe": timeframe,
@@ -200,7 +272,7 @@ def scan_asset(
             "type": result.type,
             "confidence": result.confidence,
             "price": current_price,
-            "details": result.details,
+            "details": details,
         })
 
         # Apply confidence threshold
@@ -223,6 +295,7 @@ def scan_asset(
         candidates.append({
             "pattern_name": pattern_name,
             "result": result,
+            "details": details,
         })
 
     # -----------------------------------------------------------------------
@@ -279,18 +352,24 @@ def scan_asset(
             )
 
     # -----------------------------------------------------------------------
-    # Phase 3: Dedup check and send alerts
+    # Phase 3: Dedup check, persist, then send alerts
+    #
+    # Rows are inserted (message_sent=False) before anything goes to Telegram,
+    # so a sent alert always has its DB row and the next run sees it as a
+    # duplicate. One INSERT for all of this asset's alerts, one UPDATE for the
+    # sent flags.
     # -----------------------------------------------------------------------
+    alerts: list[tuple[str, PatternResult, dict, dict]] = []   # (pattern, result, DB record, Telegram details)
     for candidate in candidates:
         pattern_name = candidate["pattern_name"]
         result = candidate["result"]
 
-        if db.is_duplicate(symbol, timeframe, pattern_name, result.type, cooldown_hours):
+        if db.is_duplicate(symbol, timeframe, pattern_name, result.type, cooldown_hours, cache=dup_cache):
             logger.info("    Duplicate within %dh – skipping", cooldown_hours)
             continue
 
         # Merge conflict note into details (stored in DB + shown in Telegram)
-        details_with_note = dict(result.details)
+        details_with_note = dict(candidate["details"])
         if conflict_note:
             details_with_note["conflict_note"] = conflict_note
 
@@ -306,8 +385,7 @@ def scan_asset(
         }
         pattern_data = {k: v for k, v in details_with_note.items()}
 
-        # Save to DB
-        alert_id = db.save_alert(
+        record = db.alert_record(
             asset=symbol,
             timeframe=timeframe,
             pattern=pattern_name,
@@ -318,8 +396,20 @@ def scan_asset(
             key_levels=key_levels,
             pattern_data=pattern_data,
         )
+        alerts.append((pattern_name, result, record, details_with_note))
+
+    if not alerts:
+        return results
+
+    # Save to DB
+    alert_ids = db.save_alerts_bulk([record for _, _, record, _ in alerts])
+
+    # Send Telegram notifications
+    sent_ids = []
+    for (pattern_name, result, _, details_with_note), alert_id in zip(alerts, alert_ids):
+        if dup_cache is not None:
+            dup_cache.add((symbol, timeframe, pattern_name, result.type))
 
-        # Send Telegram notification
         sent = send_alert(
             asset=symbol,
             timeframe=timeframe,
@@ -331,14 +421,77 @@ def scan_asset(
         )
 
         if sent and alert_id:
-            db.mark_message_sent(alert_id)
+            sent_ids.append(alert_id)
             logger.info("    Alert sent! id=%s", alert_id)
         elif not sent:
             logger.warning("    Failed to send Telegram alert for %s %s %s", symbol, timeframe, pattern_name)
 
+    db.mark_messages_sent(sent_ids)
+
     return results
 
 
+def _prefetch(jobs: list[dict]) -> list[Optional[pd.DataFrame]]:
+    """
+    Fetch OHLCV data for all jobs up front.
+    Stocks sharing a timeframe go through one batched Yahoo download;
+    everything else is fetched concurrently via fetch_many_threaded.
+    """
+    frames: dict[int, Optional[pd.DataFrame]] = {}
+
+    stocks_by_tf: dict[str, list[int]] = {}
+    for i, job in enumerate(jobs):
+        if job["asset_type"] == "stock":
+            stocks_by_tf.setdefault(job["timeframe"], []).append(i)
+
+    for tf, idxs in stocks_by_tf.items():
+        if len(idxs) > 1:
+            batch = fetch_stocks_batch([jobs[i]["symbol"] for i in idxs], tf)
+            for i in idxs:
+                frames[i] = batch.get(jobs[i]["symbol"])
+
+    rest = [i for i in range(len(jobs)) if i not in frames]
+    specs = [
+        (
+            jobs[i]["symbol"], jobs[i]["timeframe"], jobs[i]["asset_type"],
+            jobs[i]["exchange"], jobs[i]["czk_conversion"], jobs[i]["base_symbol"],
+        )
+        for i in rest
+    ]
+    frames.update(zip(rest, fetch_many_threaded(specs)))
+
+    return [frames[i] for i in range(len(jobs))]
+
+
+def _batch_detect(jobs: list[dict], frames: list[Optional[pd.DataFrame]], enabled_patterns: list[str]) -> None:
+    """
+    Run BATCH_PATTERNS over all frames in one call per pattern and seed
+    _detect_cache, so scan_asset() picks the results up as cache hits.
+    """
+    for pattern_name in BATCH_PATTERNS:
+        detector = ALL_PATTERNS.get(pattern_name)
+        if detector is None or pattern_name not in enabled_patterns:
+            continue
+
+        batch = [
+            (job, df) for job, df in zip(jobs, frames)
+            if df is not None and not df.empty and detector.supports_timeframe(job["timeframe"])
+        ]
+        if not batch:
+            continue
+
+        try:
+            results = detector.detect_many([df for _, df in batch])
+        except Exception as exc:
+            logger.error("Batch detection for %s failed: %s", pattern_name, exc)
+            continue
+
+        for (job, df), result in zip(batch, results):
+            _detect_cache[(pattern_name,) + _frame_key(job["symbol"], job["timeframe"], df)] = result
+    while len(_detect_cache) > DETECT_CACHE_SIZE:
+        _detect_cache.popitem(last=False)
+
+
 def run_scan(min_confidence: Optional[float] = None, min_rr: Optional[float] = None) -> list[dict]:
     """
     Main scan loop. Returns all detected patterns (regardless of threshold).
@@ -365,52 +518,61 @@ def run_scan(min_confidence: Optional[float] = None, min_rr: Optional[float] = N
                 min_confidence, min_rr, cooldown_hours, enabled_patterns)
     logger.info("=" * 60)
 
-    # --- Crypto assets ---
+    # --- Collect asset/timeframe jobs ---
+    jobs: list[dict] = []
     for asset_cfg in assets_cfg.get("crypto", []):
-        symbol = asset_cfg["symbol"]
-        exchange = asset_cfg.get("exchange", "kucoin")
-        timeframes = asset_cfg.get("timeframes", ["1h"])
-        czk_conversion = asset_cfg.get("czk_conversion", False)
-        base_symbol = asset_cfg.get("base_symbol")
-
-        for tf in timeframes:
-            try:
-                results = scan_asset(
-                    symbol=symbol,
-                    timeframe=tf,
-                    asset_type="crypto",
-                    exchange=exchange,
-                    enabled_patterns=enabled_patterns,
-                    min_confidence=min_confidence,
-                    min_rr=min_rr,
-                    cooldown_hours=cooldown_hours,
-                    czk_conversion=czk_conversion,
-                    base_symbol=base_symbol,
-                )
-                all_results.extend(results)
-            except Exception as exc:
-                logger.error("Unhandled error scanning %s %s: %s", symbol, tf, exc)
-
-    # --- Stock assets ---
+        for tf in asset_cfg.get("timeframes", ["1h"]):
+            jobs.append({
+                "symbol": asset_cfg["symbol"],
+                "timeframe": tf,
+                "asset_type": "crypto",
+                "exchange": asset_cfg.get("exchange", DEFAULT_EXCHANGE),
+                "czk_conversion": asset_cfg.get("czk_conversion", False),
+                "base_symbol": asset_cfg.get("base_symbol"),
+            })
     for asset_cfg in assets_cfg.get("stocks", []):
-        symbol = asset_cfg["symbol"]
-        timeframes = asset_cfg.get("timeframes", ["1d"])
-
-        for tf in timeframes:
-            try:
-                results = scan_asset(
-                    symbol=symbol,
-                    timeframe=tf,
-                    asset_type="stock",
-                    exchange="",
-                    enabled_patterns=enabled_patterns,
-                    min_confidence=min_confidence,
-                    min_rr=min_rr,
-                    cooldown_hours=cooldown_hours,
-                )
-                all_results.extend(results)
-            except Exception as exc:
-                logger.error("Unhandled error scanning %s %s: %s", symbol, tf, exc)
+        for tf in asset_cfg.get("timeframes", ["1d"]):
+            jobs.append({
+                "symbol": asset_cfg["symbol"],
+                "timeframe": tf,
+                "asset_type": "stock",
+                "exchange": "",
+                "czk_conversion": False,
+                "base_symbol": None,
+            })
+
+    # --- Alerts within the cooldown, fetched once instead of one query per candidate;
+    #     runs in the background so its round-trips overlap the OHLCV fetch ---
+    db_pool = ThreadPoolExecutor(max_workers=1)
+    dup_future = db_pool.submit(db.prime_duplicate_cache, cooldown_hours)
+    db_pool.shutdown(wait=False)
+
+    # --- Fetch all OHLCV data up front (network-bound) ---
+    frames = _prefetch(jobs)
+
+    # --- Batched detectors over all frames at once (CPU-bound, parallel kernel) ---
+    _batch_detect(jobs, frames, enabled_patterns)
+
+    dup_cache = dup_future.result()
+
+    # --- Detect + alert per asset/timeframe ---
+    for job, df in zip(jobs, frames):
+        if df is None or df.empty:
+            logger.warning("No data for %s %s – skipping", job["symbol"], job["timeframe"])
+            continue
+        try:
+            results = scan_asset(
+                **job,
+                enabled_patterns=enabled_patterns,
+                min_confidence=min_confidence,
+                min_rr=min_rr,
+                cooldown_hours=cooldown_hours,
+                df=df,
+                dup_cache=dup_cache,
+            )
+            all_results.extend(results)
+        except Exception as exc:
+            logger.error("Unhandled error scanning %s %s: %s", job["symbol"], job["timeframe"], exc)
 
     elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
     logger.info("=" * 60)
@@ -0,0 +1,83 @@
+"""
+On-disk TTL cache for OHLCV DataFrames.
+
+Most scans within one bar period request identical candles, so fetched frames
+are stored as parquet files and served from disk until they are older than the
+timeframe-dependent TTL. Entries are keyed by (asset_type, symbol, timeframe,
+exchange); freshness is taken from the file mtime.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Max age of a cached frame per timeframe (seconds)
+TTL_SECONDS = {
+    "1h": 5 * 60,
+    "4h": 30 * 60,
+    "1d": 12 * 3600,
+}
+
+DEFAULT_TTL = 5 * 60
+
+
+class FileCache:
+    """Parquet-backed OHLCV cache with per-entry TTL."""
+
+    def __init__(self, path: str = ".cache/ohlcv"):
+        self.path = Path(path)
+
+    @staticmethod
+    def key(asset_type: str, symbol: str, timeframe: str, exchange: str = "") -> str:
+        return hashlib.md5(f"{asset_type}|{symbol}|{timeframe}|{exchange}".encode()).hexdigest()
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{key}.parquet"
+
+    def get(self, key: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """Return the cached frame if it is younger than the timeframe TTL, else None."""
+        file = self._file(key)
+        try:
+            age = time.time() - file.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+        if age >= TTL_SECONDS.get(timeframe, DEFAULT_TTL):
+            return None
+
+        try:
+            return pd.read_parquet(file)
+        except Exception as exc:
+            logger.warning("Failed to read OHLCV cache %s: %s", file.name, exc)
+            return None
+
+    def get_stale(self, key: str) -> Optional[pd.DataFrame]:
+        """Return the cached frame regardless of age (base for incremental refresh)."""
+        file = self._file(key)
+        if not file.exists():
+            return None
+        try:
+            return pd.read_parquet(file)
+        except Exception as exc:
+            logger.warning("Failed to read OHLCV cache %s: %s", file.name, exc)
+            return None
+
+    def set(self, key: str, df: pd.DataFrame) -> None:
+        """Store a frame; written to a temp file first so readers never see a partial file."""
+        file = self._file(key)
+        tmp = file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp)
+            os.replace(tmp, file)
+        except Exception as exc:
+            logger.warning("Failed to write OHLCV cache %s: %s", file.name, exc)
+            tmp.unlink(missing_ok=True)
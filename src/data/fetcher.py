@@ -8,17 +8,23 @@ NOTE: Binance blocks GitHub Actions servers (HTTP 451 geo-restriction).
       BTC/CZK and ETH/CZK are fetched as USDT pairs and converted via CNB rate.
 """
 
+import functools
+import io
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import ccxt
+import numpy as np
 import pandas as pd
 import requests
 import yfinance as yf
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Cache for CNB USD/CZK rate (valid 1 hour)
-_czk_rate_cache: dict = {"rate": None, "ts": 0}
+from .cache import FileCache
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +38,35 @@ _SESSION.headers.update({
     )
 })
 
+# Transient HTTP failures (rate limits, 5xx, dropped connections) are retried
+# inside the connection pool with exponential backoff and Retry-After support.
+# The last response is returned rather than raised, so callers (ccxt, yfinance,
+# raise_for_status) still map status codes to their own errors.
+_HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=2,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    raise_on_status=False,
+)
+_SESSION.mount("https://", HTTPAdapter(max_retries=_HTTP_RETRY))
+_SESSION.mount("http://", HTTPAdapter(max_retries=_HTTP_RETRY))
+
+# On-disk OHLCV cache – repeated scans within a bar period skip the network
+_CACHE = FileCache()
+
+# ccxt exchange instances, created lazily and reused across calls so markets,
+# HTTP sessions and TLS connections are not rebuilt on every fetch
+_EXCHANGES: dict[str, ccxt.Exchange] = {}
+_EXCHANGES_LOCK = threading.Lock()
+
+# Per-exchange cap on in-flight ccxt requests when fetching from many threads
+EXCHANGE_CONCURRENCY = 4
+_EXCHANGE_SLOTS: dict[str, threading.Semaphore] = {}
+
+# Exchange used for crypto when none is configured
+DEFAULT_EXCHANGE = "kucoin"
+
 # Timeframe mappings
 CCXT_TIMEFRAME_MAP = {
     "1h": "1h",
@@ -39,6 +74,9 @@ CCXT_TIMEFRAME_MAP = {
     "1d": "1d",
 }
 
+# Max concurrent fetches in fetch_many_threaded (keeps us well under exchange rate limits)
+FETCH_CONCURRENCY = 8
+
 # Number of candles to fetch per timeframe
 CANDLE_COUNTS = {
     "1h": 200,
@@ -46,14 +84,31 @@ CANDLE_COUNTS = {
     "1d": 200,
 }
 
+# Candle duration per timeframe (seconds)
+TIMEFRAME_SECONDS = {
+    "1h": 3600,
+    "4h": 4 * 3600,
+    "1d": 24 * 3600,
+}
+
+# Incremental refresh (crypto): if an expired cached frame is at most this many
+# candles behind, only the missing candles are fetched and appended to it.
+# Stocks are always fetched in full – auto_adjust restates the whole history
+# after a dividend or split, so new bars cannot be appended to old adjusted ones.
+INCREMENTAL_MAX_BARS = 50
+
 
 def _retry(func, *args, max_attempts: int = 3, **kwargs):
-    """Exponential backoff retry wrapper."""
+    """
+    Exponential backoff retry wrapper for ccxt network errors.
+    HTTP-level retries are handled by the session adapter; this only covers
+    what ccxt raises on top of it (timeouts, DDoS protection, exchange outages).
+    """
     delays = [2, 4, 8]
     for attempt in range(max_attempts):
         try:
             return func(*args, **kwargs)
-        except Exception as exc:
+        except ccxt.NetworkError as exc:
             if attempt == max_attempts - 1:
                 raise
             wait = delays[attempt]
@@ -64,11 +119,60 @@ def _retry(func, *args, max_attempts: int = 3, **kwargs):
             time.sleep(wait)
 
 
+def _get_exchange(exchange_id: str) -> ccxt.Exchange:
+    """Return a shared ccxt exchange instance for `exchange_id`."""
+    exchange = _EXCHANGES.get(exchange_id)
+    if exchange is None:
+        with _EXCHANGES_LOCK:
+            exchange = _EXCHANGES.get(exchange_id)
+            if exchange is None:
+                exchange_class = getattr(ccxt, exchange_id)
+                exchange = exchange_class({"enableRateLimit": True, "session": _SESSION})
+                _EXCHANGES[exchange_id] = exchange
+                _EXCHANGE_SLOTS[exchange_id] = threading.Semaphore(EXCHANGE_CONCURRENCY)
+    return exchange
+
+
+def _incremental_start(stale: Optional[pd.DataFrame], timeframe: str) -> Optional[pd.Timestamp]:
+    """
+    Timestamp to resume fetching from, or None if a full fetch is needed.
+    The last cached candle is re-fetched too, since it may have been incomplete.
+    """
+    if stale is None or stale.empty:
+        return None
+    last_ts = stale.index[-1]
+    bars_behind = (pd.Timestamp.now(tz="UTC") - last_ts).total_seconds() / TIMEFRAME_SECONDS.get(timeframe, 3600)
+    if bars_behind > INCREMENTAL_MAX_BARS:
+        return None
+    return last_ts
+
+
+def _merge_candles(old: pd.DataFrame, new: pd.DataFrame, n: int) -> pd.DataFrame:
+    """Append new candles to old ones (newer values win on overlap), keep last n."""
+    df = pd.concat([old, new])
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    return df.tail(n)
+
+
+_OHLCV_COLS = ["open", "high", "low", "close", "volume"]
+_BAR_4H_NS = 4 * 3600 * 10**9
+
+
 def _resample_to_4h(df_1h: pd.DataFrame) -> pd.DataFrame:
     """Resample 1h OHLCV DataFrame to 4h candles."""
-    df = df_1h.copy()
-    df.index = pd.to_datetime(df.index)
-    ohlcv_4h = df.resample("4h").agg(
+    if not isinstance(df_1h.index, pd.DatetimeIndex):
+        df_1h = df_1h.copy()
+        df_1h.index = pd.to_datetime(df_1h.index, cache=True)
+    # resample only takes its fast binning path on a sorted index
+    if not df_1h.index.is_monotonic_increasing:
+        df_1h = df_1h.sort_index()
+
+    fast = _resample_to_4h_numpy(df_1h)
+    if fast is not None:
+        return fast
+
+    # epoch origin: 00/04/08/... UTC bins regardless of where the data starts
+    return df_1h.resample("4h", origin="epoch").agg(
         {
             "open": "first",
             "high": "max",
@@ -77,13 +181,51 @@ def _resample_to_4h(df_1h: pd.DataFrame) -> pd.DataFrame:
             "volume": "sum",
         }
     ).dropna()
-    return ohlcv_4h
+
+
+def _resample_to_4h_numpy(df_1h: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """
+    Same aggregation as the pandas path, computed with ufunc.reduceat over
+    4h epoch buckets. Returns None (caller falls back to pandas) for inputs
+    it does not cover: non-UTC timezones, missing columns or NaN values.
+    """
+    index = df_1h.index
+    if len(index) == 0 or (index.tz is not None and str(index.tz) != "UTC"):
+        return None
+    if any(col not in df_1h.columns for col in _OHLCV_COLS):
+        return None
+
+    arr = df_1h[_OHLCV_COLS].to_numpy(dtype=np.float64)
+    if np.isnan(arr).any():
+        return None
+
+    # Bucket number per row; a new bucket starts wherever it changes
+    buckets = index.asi8 // _BAR_4H_NS
+    starts = np.flatnonzero(np.diff(buckets)) + 1
+    starts = np.concatenate(([0], starts))
+    ends = np.append(starts[1:], len(arr)) - 1
+
+    out = np.column_stack((
+        arr[starts, 0],
+        np.maximum.reduceat(arr[:, 1], starts),
+        np.minimum.reduceat(arr[:, 2], starts),
+        arr[ends, 3],
+        np.add.reduceat(arr[:, 4], starts),
+    ))
+    new_index = pd.DatetimeIndex(buckets[starts] * _BAR_4H_NS, tz=index.tz, name=index.name)
+    return pd.DataFrame(out, index=new_index, columns=_OHLCV_COLS)
 
 
 def fetch_stock_data(symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
     """
     Fetch stock OHLCV data via yfinance with browser User-Agent.
     """
+    cache_key = FileCache.key("stock", symbol, timeframe)
+    cached = _CACHE.get(cache_key, timeframe)
+    if cached is not None:
+        logger.info("Cache hit: %d candles for %s (%s)", len(cached), symbol, timeframe)
+        return cached
+
     try:
         if timeframe in ("1h", "4h"):
             interval = "1h"
@@ -97,7 +239,7 @@ def fetch_stock_data(symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
             df = ticker.history(period=period, interval=interval, auto_adjust=True)
             return df
 
-        df = _retry(_download)
+        df = _download()
 
         if df is None or df.empty:
             logger.warning("No data returned for stock %s (%s)", symbol, timeframe)
@@ -105,15 +247,15 @@ def fetch_stock_data(symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
 
         df.columns = [c.lower() for c in df.columns]
         df = df[["open", "high", "low", "close", "volume"]].copy()
-        df.index = pd.to_datetime(df.index, utc=True)
+        df.index = pd.to_datetime(df.index, utc=True, cache=True)
 
         if timeframe == "4h":
             df = _resample_to_4h(df)
 
-        n = CANDLE_COUNTS.get(timeframe, 200)
-        df = df.tail(n)
+        df = df.tail(CANDLE_COUNTS.get(timeframe, 200))
 
         logger.info("Fetched %d candles for %s (%s)", len(df), symbol, timeframe)
+        _CACHE.set(cache_key, df)
         return df
 
     except Exception as exc:
@@ -121,37 +263,135 @@ def fetch_stock_data(symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
         return None
 
 
+# Yahoo accepts roughly this many tickers per download request
+STOCK_BATCH_SIZE = 20
+
+
+def fetch_stocks_batch(symbols: list[str], timeframe: str) -> dict[str, Optional[pd.DataFrame]]:
+    """
+    Fetch several stocks with one yf.download call per chunk of STOCK_BATCH_SIZE
+    tickers instead of one HTTP round-trip per symbol.
+    Cached symbols are served from disk; only misses are downloaded.
+
+    Returns:
+        {symbol: normalized OHLCV DataFrame or None}
+    """
+    if timeframe in ("1h", "4h"):
+        interval = "1h"
+        period = "60d"
+    else:
+        interval = "1d"
+        period = "1y"
+    n = CANDLE_COUNTS.get(timeframe, 200)
+
+    out: dict[str, Optional[pd.DataFrame]] = {}
+    missing = []
+    for symbol in symbols:
+        cached = _CACHE.get(FileCache.key("stock", symbol, timeframe), timeframe)
+        if cached is not None:
+            out[symbol] = cached
+        else:
+            missing.append(symbol)
+
+    for i in range(0, len(missing), STOCK_BATCH_SIZE):
+        chunk = missing[i:i + STOCK_BATCH_SIZE]
+        try:
+            data = yf.download(
+                tickers=" ".join(chunk),
+                period=period,
+                interval=interval,
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+                session=_SESSION,
+            )
+        except Exception as exc:
+            logger.error("Batch download failed for %s (%s): %s", chunk, timeframe, exc)
+            out.update({symbol: None for symbol in chunk})
+            continue
+
+        for symbol in chunk:
+            try:
+                df = data[symbol] if isinstance(data.columns, pd.MultiIndex) else data
+                df = df.rename(columns=str.lower)[["open", "high", "low", "close", "volume"]].dropna(how="all")
+            except KeyError:
+                df = None
+
+            if df is None or df.empty:
+                logger.warning("No data returned for stock %s (%s)", symbol, timeframe)
+                out[symbol] = None
+                continue
+
+            df.index = pd.to_datetime(df.index, utc=True, cache=True)
+            if timeframe == "4h":
+                df = _resample_to_4h(df)
+            df = df.tail(n)
+
+            logger.info("Fetched %d candles for %s (%s)", len(df), symbol, timeframe)
+            _CACHE.set(FileCache.key("stock", symbol, timeframe), df)
+            out[symbol] = df
+
+    return out
+
+
 def fetch_crypto_data(symbol: str, exchange_id: str, timeframe: str) -> Optional[pd.DataFrame]:
     """
     Fetch crypto OHLCV data via ccxt.
     Default exchange: KuCoin (no geo-restrictions, no API key needed).
     Binance is blocked on GitHub Actions (HTTP 451).
     """
+    cache_key = FileCache.key("crypto", symbol, timeframe, exchange_id)
+    cached = _CACHE.get(cache_key, timeframe)
+    if cached is not None:
+        logger.info("Cache hit: %d candles for %s (%s)", len(cached), symbol, timeframe)
+        return cached
+
+    stale = _CACHE.get_stale(cache_key)
+    since = _incremental_start(stale, timeframe)
+
     try:
-        exchange_class = getattr(ccxt, exchange_id)
-        exchange: ccxt.Exchange = exchange_class({"enableRateLimit": True})
+        exchange = _get_exchange(exchange_id)
 
         ccxt_tf = CCXT_TIMEFRAME_MAP.get(timeframe, timeframe)
         limit = CANDLE_COUNTS.get(timeframe, 200)
 
-        def _fetch():
+        def _fetch(since):
+            if since is not None:
+                since_ms = int(since.timestamp() * 1000)
+                return exchange.fetch_ohlcv(
+                    symbol, timeframe=ccxt_tf, since=since_ms, limit=INCREMENTAL_MAX_BARS + 1,
+                )
             ohlcv = exchange.fetch_ohlcv(symbol, timeframe=ccxt_tf, limit=limit)
             return ohlcv
 
-        ohlcv = _retry(_fetch)
+        with _EXCHANGE_SLOTS[exchange_id]:
+            ohlcv = _retry(_fetch, since)
+            if not ohlcv and since is not None:
+                # The last cached candle is always re-requested, so an empty
+                # answer is a failure (throttling, outage), not "nothing new"
+                logger.warning(
+                    "Empty incremental response for crypto %s (%s) – fetching in full",
+                    symbol, timeframe,
+                )
+                since = None
+                ohlcv = _retry(_fetch, since)
 
         if not ohlcv:
             logger.warning("No data returned for crypto %s (%s)", symbol, timeframe)
             return None
 
-        df = pd.DataFrame(
-            ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
-        df.set_index("timestamp", inplace=True)
-        df = df.astype(float)
+        # One typed allocation instead of object-dtype frame + astype(float) copy
+        arr = np.asarray(ohlcv, dtype=np.float64)
+        ts = pd.to_datetime(arr[:, 0].astype(np.int64), unit="ms", utc=True, cache=True)
+        df = pd.DataFrame(arr[:, 1:], index=ts, columns=["open", "high", "low", "close", "volume"])
+        df.index.name = "timestamp"
+
+        if since is not None:
+            df = _merge_candles(stale, df, limit)
 
         logger.info("Fetched %d candles for %s (%s)", len(df), symbol, timeframe)
+        _CACHE.set(cache_key, df)
         return df
 
     except Exception as exc:
@@ -162,35 +402,43 @@ def fetch_crypto_data(symbol: str, exchange_id: str, timeframe: str) -> Optional
         return None
 
 
+# Serializes CNB refreshes so concurrent fetch threads trigger a single request
+_CZK_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _usd_czk_bucket(hour: int) -> float:
+    """
+    Fetch USD/CZK from CNB, memoized per hour bucket (`hour` = epoch hours).
+    Raises on failure so that errors are never cached.
+    """
+    # CNB daily FX rates – plain text format
+    resp = _SESSION.get(
+        "https://www.cnb.cz/en/financial-markets/foreign-exchange-market/"
+        "central-bank-exchange-rate-fixing/central-bank-exchange-rate-fixing/"
+        "daily.txt",
+        timeout=10,
+    )
+    resp.raise_for_status()
+    # Format: date line, then header Country|Currency|Amount|Code|Rate
+    rates = pd.read_csv(io.StringIO(resp.text), sep="|", skiprows=1, dtype=str)
+    usd = rates[rates["Code"] == "USD"]
+    if usd.empty:
+        raise ValueError("USD row missing in CNB daily rates")
+    row = usd.iloc[0]
+    usd_czk = float(row["Rate"].replace(",", ".")) / float(row["Amount"])
+    logger.info("USD/CZK rate from CNB: %.2f", usd_czk)
+    return usd_czk
+
+
 def get_usd_czk_rate() -> Optional[float]:
     """
     Fetch current USD/CZK exchange rate from CNB (Czech National Bank) public API.
     Free, no API key required. Cached for 1 hour.
     """
-    now = time.time()
-    if _czk_rate_cache["rate"] and now - _czk_rate_cache["ts"] < 3600:
-        return _czk_rate_cache["rate"]
-
     try:
-        # CNB daily FX rates – plain text format
-        resp = requests.get(
-            "https://www.cnb.cz/en/financial-markets/foreign-exchange-market/"
-            "central-bank-exchange-rate-fixing/central-bank-exchange-rate-fixing/"
-            "daily.txt",
-            timeout=10,
-        )
-        resp.raise_for_status()
-        # Format: Country|Currency|Amount|Code|Rate
-        for line in resp.text.splitlines():
-            parts = line.split("|")
-            if len(parts) == 5 and parts[3] == "USD":
-                amount = float(parts[2])
-                rate = float(parts[4].replace(",", "."))
-                usd_czk = rate / amount
-                _czk_rate_cache["rate"] = usd_czk
-                _czk_rate_cache["ts"] = now
-                logger.info("USD/CZK rate from CNB: %.2f", usd_czk)
-                return usd_czk
+        with _CZK_LOCK:
+            return _usd_czk_bucket(int(time.time() // 3600))
     except Exception as exc:
         logger.error("Failed to fetch USD/CZK rate from CNB: %s", exc)
 
@@ -204,16 +452,24 @@ def fetch_czk_data(base_symbol: str, exchange_id: str, timeframe: str) -> Option
     Fetch USDT pair (e.g. BTC/USDT) and convert all price columns to CZK
     using the current USD/CZK rate from CNB.
     """
-    df = fetch_crypto_data(base_symbol, exchange_id, timeframe)
+    # CNB and the exchange are different hosts – overlap the two round-trips
+    # instead of running them back to back
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        rate_future = pool.submit(get_usd_czk_rate)
+        df = fetch_crypto_data(base_symbol, exchange_id, timeframe)
+        rate = rate_future.result()
+
     if df is None or df.empty:
         return None
 
-    rate = get_usd_czk_rate()
     if rate is None:
         return None
 
     price_cols = ["open", "high", "low", "close"]
-    df[price_cols] = df[price_cols] * rate
+    # Scale one float64 array in place instead of building a temporary frame
+    prices = df[price_cols].to_numpy(dtype=np.float64)
+    np.multiply(prices, rate, out=prices)
+    df[price_cols] = prices
     logger.info(
         "Converted %s → CZK at rate %.2f (source: CNB)", base_symbol, rate
     )
@@ -224,7 +480,7 @@ def fetch_asset_data(
     symbol: str,
     timeframe: str,
     asset_type: str,
-    exchange: str = "kucoin",
+    exchange: str = DEFAULT_EXCHANGE,
     czk_conversion: bool = False,
     base_symbol: Optional[str] = None,
 ) -> Optional[pd.DataFrame]:
@@ -235,7 +491,7 @@ def fetch_asset_data(
         symbol: Display symbol (e.g. 'BTC/CZK')
         timeframe: '1h', '4h', or '1d'
         asset_type: 'stock' or 'crypto'
-        exchange: Exchange id for crypto (default 'kucoin')
+        exchange: Exchange id for crypto (default DEFAULT_EXCHANGE)
         czk_conversion: If True, fetch base_symbol in USDT and convert to CZK via CNB
         base_symbol: USDT pair to fetch when czk_conversion=True (e.g. 'BTC/USDT')
     """
@@ -248,3 +504,33 @@ def fetch_asset_data(
     else:
         logger.error("Unknown asset_type: %s", asset_type)
         return None
+
+
+def fetch_many_threaded(
+    specs: list[tuple], max_workers: int = FETCH_CONCURRENCY
+) -> list[Optional[pd.DataFrame]]:
+    """
+    Fetch many assets concurrently on a thread pool.
+
+    Socket reads release the GIL, so the round-trips overlap; requests to the
+    same exchange are additionally capped by EXCHANGE_CONCURRENCY.
+
+    Args:
+        specs: list of positional-argument tuples for fetch_asset_data, i.e.
+               (symbol, timeframe, asset_type[, exchange, czk_conversion, base_symbol])
+        max_workers: max number of fetches in flight at once
+
+    Returns:
+        DataFrames (or None on failure) in the same order as specs.
+    """
+    def _safe(spec: tuple) -> Optional[pd.DataFrame]:
+        try:
+            return fetch_asset_data(*spec)
+        except Exception as exc:
+            logger.error("Concurrent fetch failed for %s (%s): %s", spec[0], spec[1], exc)
+            return None
+
+    if not specs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(specs))) as pool:
+        return list(pool.map(_safe, specs))
@@ -5,16 +5,27 @@ Telegram notification module.
 - run_bot(): starts the interactive bot with /status, /scan, /alerts, /help commands
 """
 
+import asyncio
+import functools
 import logging
 import os
 import time
 from datetime import datetime, timezone
 from typing import Optional
 
+import orjson
+import pandas as pd
 import requests
 
 logger = logging.getLogger(__name__)
 
+# Kept-alive connection to api.telegram.org, shared by all synchronous sends
+_SESSION = requests.Session()
+_SESSION.headers.update({"Content-Type": "application/json"})
+
+# Application of the currently running bot – a second run_bot() call reuses it
+_APPLICATION = None
+
 PATTERN_DESCRIPTIONS = {
     "double_top_bottom": {
         "bullish": "Dvě podobná dna s vrcholem mezi nimi – cenový vzor signalizující možný vzestup.",
@@ -92,6 +103,18 @@ def _get_dashboard_url() -> str:
     return os.environ.get("DASHBOARD_URL", "")
 
 
+@functools.lru_cache(maxsize=4)
+def _load_cfg(mtime_ns: int) -> dict:
+    """Parse config.yaml; keyed by file mtime so it is re-read only after a change."""
+    import yaml
+    with open("config.yaml") as f:
+        return yaml.safe_load(f)
+
+
+_SIGNAL_EMOJI = {"bullish": "🟢", "bearish": "🔴", "neutral": "⚠️"}
+_SIGNAL_LABELS = {"bullish": "BULLISH SIGNAL", "bearish": "BEARISH SIGNAL", "neutral": "NEUTRAL SIGNAL"}
+
+
 def _format_alert_message(
     asset: str,
     timeframe: str,
@@ -101,51 +124,46 @@ def _format_alert_message(
     price: float,
     details: dict,
 ) -> str:
-    emoji = {"bullish": "🟢", "bearish": "🔴", "neutral": "⚠️"}.get(signal_type, "⚠️")
-    signal_label = {"bullish": "BULLISH SIGNAL", "bearish": "BEARISH SIGNAL", "neutral": "NEUTRAL SIGNAL"}.get(
-        signal_type, "SIGNAL"
-    )
+    emoji = _SIGNAL_EMOJI.get(signal_type, "⚠️")
+    signal_label = _SIGNAL_LABELS.get(signal_type, "SIGNAL")
 
     pattern_name = PATTERN_NAMES_CZ.get(pattern, pattern)
     description = PATTERN_DESCRIPTIONS.get(pattern, {}).get(signal_type, "Detekován technický vzor.")
 
-    price_str = _format_price(price, asset)
     now_utc = datetime.now(timezone.utc).strftime("%d.%m.%Y %H:%M UTC")
 
+    # Lines are collected and joined once instead of concatenating the message
+    parts = [
+        f"{emoji} {signal_label} – {asset} ({timeframe})",
+        f"📊 Pattern: {pattern_name}",
+        f"💪 Confidence: {confidence:.0f} %",
+        f"💰 Cena: {_format_price(price, asset)}",
+        "",
+        "📖 Co to znamená:",
+        description,
+    ]
+
     # Key levels from details
     resistance = details.get("resistance")
     support = details.get("support")
-
-    levels_lines = ""
-    if resistance:
-        levels_lines += f"  Odpor: {_format_price(float(resistance), asset)}\n"
-    if support:
-        levels_lines += f"  Podpora: {_format_price(float(support), asset)}"
+    if resistance or support:
+        parts += ["", "📏 Klíčové úrovně:"]
+        if resistance:
+            parts.append(f"  Odpor: {_format_price(float(resistance), asset)}")
+        if support:
+            parts.append(f"  Podpora: {_format_price(float(support), asset)}")
 
     conflict_note = details.get("conflict_note")
-
-    msg = (
-        f"{emoji} {signal_label} – {asset} ({timeframe})\n"
-        f"📊 Pattern: {pattern_name}\n"
-        f"💪 Confidence: {confidence:.0f} %\n"
-        f"💰 Cena: {price_str}\n"
-        f"\n"
-        f"📖 Co to znamená:\n"
-        f"{description}\n"
-    )
-
-    if levels_lines:
-        msg += f"\n📏 Klíčové úrovně:\n{levels_lines}\n"
-
     if conflict_note:
-        msg += f"\n{conflict_note}\n"
+        parts += ["", conflict_note]
 
+    parts.append("")
     dashboard_url = _get_dashboard_url()
     if dashboard_url:
-        msg += f"\n🌐 Dashboard: {dashboard_url}"
+        parts.append(f"🌐 Dashboard: {dashboard_url}")
 
-    msg += f"\n⏰ {now_utc}"
-    return msg
+    parts.append(f"⏰ {now_utc}")
+    return "\n".join(parts)
 
 
 def send_alert(
@@ -172,15 +190,12 @@ def send_alert(
 def _send_message(token: str, chat_id: str, text: str) -> bool:
     """Send a plain text message via Telegram Bot API."""
     url = f"https://api.telegram.org/bot{token}/sendMessage"
+    payload = orjson.dumps({"chat_id": chat_id, "text": text, "parse_mode": "HTML"})
     delays = [2, 4, 8]
 
     for attempt in range(3):
         try:
-            resp = requests.post(
-                url,
-                json={"chat_id": chat_id, "text": text, "parse_mode": "HTML"},
-                timeout=15,
-            )
+            resp = _SESSION.post(url, data=payload, timeout=15)
             if resp.status_code == 200:
                 return True
             logger.warning("Telegram API returned %s: %s", resp.status_code, resp.text)
@@ -202,17 +217,26 @@ def _send_message(token: str, chat_id: str, text: str) -> bool:
 async def run_bot(scanner_func=None) -> None:
     """
     Start a Telegram bot that handles commands.
-    scanner_func: async callable that performs a scan and returns list of results.
+    scanner_func: callable that performs a scan and returns list of results –
+    either async, or a plain function such as main.run_scan. A plain function
+    (with its blocking fetches, DB calls and send_alert) runs in a worker
+    thread, so the bot keeps answering commands during the scan.
     """
     try:
         from telegram import Update
         from telegram.ext import Application, CommandHandler, ContextTypes
+        from telegram.request import HTTPXRequest
     except ImportError:
         logger.error("python-telegram-bot not installed")
         return
 
     from src.storage import supabase_client as db
 
+    global _APPLICATION
+    if _APPLICATION is not None and _APPLICATION.running:
+        logger.info("Telegram bot already running – reusing existing application")
+        return
+
     token = _get_token()
     if not token:
         logger.error("TELEGRAM_TOKEN not set – cannot start bot")
@@ -229,17 +253,15 @@ async def run_bot(scanner_func=None) -> None:
         await update.message.reply_text(text, parse_mode="HTML")
 
     async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        import yaml, os
         try:
-            with open("config.yaml") as f:
-                cfg = yaml.safe_load(f)
+            cfg = _load_cfg(os.stat("config.yaml").st_mtime_ns)
             crypto_assets = [a["symbol"] for a in cfg.get("assets", {}).get("crypto", [])]
             stock_assets = [a["symbol"] for a in cfg.get("assets", {}).get("stocks", [])]
             all_assets = crypto_assets + stock_assets
         except Exception:
             all_assets = ["N/A"]
 
-        stats = db.get_run_stats()
+        stats = await asyncio.to_thread(db.get_run_stats)
         text = (
             "📡 <b>Status skeneru</b>\n\n"
             f"🔍 Sledovaná aktiva: {', '.join(all_assets)}\n"
@@ -249,18 +271,26 @@ async def run_bot(scanner_func=None) -> None:
         await update.message.reply_text(text, parse_mode="HTML")
 
     async def cmd_alerts(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        alerts = db.get_recent_alerts(10)
+        alerts = await asyncio.to_thread(db.get_recent_alerts, 10)
         if not alerts:
             await update.message.reply_text("Žádné alertů v databázi.")
             return
 
+        # Fields pulled out once per row, then formatted from plain tuples
+        rows = [
+            (
+                a["asset"], a["timeframe"], a["pattern"], a["confidence"], a["price"],
+                a.get("type", ""), a.get("detected_at", "")[:16].replace("T", " "),
+            )
+            for a in alerts
+        ]
+
         lines = ["📊 <b>Posledních 10 alertů</b>\n"]
-        for a in alerts:
-            emoji = {"bullish": "🟢", "bearish": "🔴"}.get(a.get("type", ""), "⚠️")
-            ts = a.get("detected_at", "")[:16].replace("T", " ")
+        for asset, tf, pat, conf, price, sig, ts in rows:
+            emoji = _SIGNAL_EMOJI.get(sig, "⚠️")
             lines.append(
-                f"{emoji} {a['asset']} ({a['timeframe']}) – {PATTERN_NAMES_CZ.get(a['pattern'], a['pattern'])} "
-                f"[{a['confidence']}%] @ ${a['price']:,.2f} [{ts}]"
+                f"{emoji} {asset} ({tf}) – {PATTERN_NAMES_CZ.get(pat, pat)} "
+                f"[{conf}%] @ ${price:,.2f} [{ts}]"
             )
         await update.message.reply_text("\n".join(lines), parse_mode="HTML")
 
@@ -270,26 +300,43 @@ async def run_bot(scanner_func=None) -> None:
             await update.message.reply_text("⚠️ Scanner funkce není dostupná.")
             return
         try:
-            results = await scanner_func(min_confidence=0)
+            if asyncio.iscoroutinefunction(scanner_func):
+                results = await scanner_func(min_confidence=0)
+            else:
+                results = await asyncio.to_thread(scanner_func, min_confidence=0)
             if not results:
                 await update.message.reply_text("✅ Scan dokončen – žádné vzory nebyly nalezeny.")
                 return
-            lines = [f"🔍 <b>Scan výsledky ({len(results)} vzorů)</b>\n"]
-            for r in results[:20]:
-                emoji = {"bullish": "🟢", "bearish": "🔴"}.get(r.get("type", ""), "⚠️")
-                lines.append(
-                    f"{emoji} {r['asset']} ({r['timeframe']}) – "
-                    f"{PATTERN_NAMES_CZ.get(r['pattern'], r['pattern'])} [{r['confidence']:.0f}%]"
-                )
+            # Result lines built with column-wise string ops instead of a per-row loop
+            df = pd.DataFrame(results[:20])
+            emoji = df["type"].map(_SIGNAL_EMOJI).fillna("⚠️") if "type" in df else "⚠️"
+            line = (
+                emoji + " " + df["asset"] + " (" + df["timeframe"] + ") – "
+                + df["pattern"].map(PATTERN_NAMES_CZ).fillna(df["pattern"])
+                + " [" + df["confidence"].round(0).astype(int).astype(str) + "%]"
+            )
+            lines = [f"🔍 <b>Scan výsledky ({len(results)} vzorů)</b>\n", *line.tolist()]
             await update.message.reply_text("\n".join(lines), parse_mode="HTML")
         except Exception as exc:
             await update.message.reply_text(f"❌ Chyba při scanu: {exc}")
 
-    app = Application.builder().token(token).build()
+    # Pooled keep-alive connections for API calls; long polling gets its own
+    # connection with a read timeout above the getUpdates poll interval
+    app = (
+        Application.builder()
+        .token(token)
+        .request(HTTPXRequest(connection_pool_size=16, read_timeout=30, http_version="1.1"))
+        .get_updates_request(HTTPXRequest(connection_pool_size=1, read_timeout=30, http_version="1.1"))
+        .build()
+    )
     app.add_handler(CommandHandler("help", cmd_help))
     app.add_handler(CommandHandler("status", cmd_status))
     app.add_handler(CommandHandler("alerts", cmd_alerts))
     app.add_handler(CommandHandler("scan", cmd_scan))
 
+    _APPLICATION = app
     logger.info("Starting Telegram bot...")
-    await app.run_polling(allowed_updates=["message"])
+    try:
+        await app.run_polling(allowed_updates=["message"])
+    finally:
+        _APPLICATION = None
@@ -0,0 +1,102 @@
+"""
+Local extrema search shared by the pattern detectors.
+
+Drop-in replacement for
+    argrelextrema(a, np.greater_equal, order=k)[0]   -> peaks(a, k)
+    argrelextrema(a, np.less_equal,    order=k)[0]   -> troughs(a, k)
+computed in a single compiled pass instead of 2*k shifted array comparisons.
+Semantics match scipy's default mode='clip': index i qualifies when a[i] is
+>= (resp. <=) every in-bounds neighbour within `order` positions, so the
+first/last bars can qualify and plateaus report every bar. With
+collapse=True a flat run of equal qualifying values reports only its first
+bar, so a flat top is one peak rather than several adjacent ones.
+"""
+
+import numpy as np
+
+from ._numba import aot, eager, njit
+
+
+@njit(cache=True)
+def _is_extremum(arr, i, order, mode):
+    """True if arr[i] is >= (mode=0) / <= (mode=1) every in-bounds neighbour within `order`."""
+    n = len(arr)
+    v = arr[i]
+    for j in range(max(0, i - order), min(n - 1, i + order) + 1):
+        # Written as "not (v >= x)" so NaN never qualifies, like scipy
+        if mode == 0:
+            if not (v >= arr[j]):
+                return False
+        else:
+            if not (v <= arr[j]):
+                return False
+    return True
+
+
+@njit(*eager("local_extrema"), cache=True)
+def local_extrema(arr, order, mode, collapse=False):
+    """
+    Indices of local maxima (mode=0) or minima (mode=1) of a float64 array.
+    collapse=True keeps only the first bar of each run of adjacent equal extrema.
+    """
+    n = len(arr)
+    out = np.empty(n, dtype=np.int64)
+    count = 0
+    last = -2
+    for i in range(n):
+        if _is_extremum(arr, i, order, mode):
+            if not (collapse and last == i - 1 and arr[last] == arr[i]):
+                out[count] = i
+                count += 1
+            last = i
+    return out[:count]
+
+
+# Python-level entry point: AOT build if present, else the JIT kernel. Kernels
+# that call local_extrema from inside numba keep using the @njit version.
+_local_extrema = aot("local_extrema") or local_extrema
+
+
+def peaks(arr, order: int, collapse: bool = False) -> np.ndarray:
+    """Local maxima indices – same result as argrelextrema(arr, np.greater_equal, order)[0]."""
+    return _local_extrema(np.ascontiguousarray(arr, dtype=np.float64), order, 0, collapse)
+
+
+def troughs(arr, order: int, collapse: bool = False) -> np.ndarray:
+    """Local minima indices – same result as argrelextrema(arr, np.less_equal, order)[0]."""
+    return _local_extrema(np.ascontiguousarray(arr, dtype=np.float64), order, 1, collapse)
+
+
+def between(idx: np.ndarray, lo: int, hi: int) -> np.ndarray:
+    """Entries of the sorted index array strictly between lo and hi (binary search, no copy)."""
+    return idx[np.searchsorted(idx, lo, side="right"):np.searchsorted(idx, hi, side="left")]
+
+
+@njit(*eager("nearest_peak_above"), cache=True)
+def nearest_peak_above(highs, level, order):
+    """
+    Lowest local maximum strictly above `level`; highs.max() if there is none.
+    Only bars above the level (and below the best so far) get the neighbour
+    check, so no index array is materialized.
+    """
+    best = np.inf
+    for i in range(len(highs)):
+        v = highs[i]
+        if v > level and v < best and _is_extremum(highs, i, order, 0):
+            best = v
+    if best == np.inf:
+        return highs.max()
+    return best
+
+
+@njit(*eager("nearest_trough_below"), cache=True)
+def nearest_trough_below(lows, level, order):
+    """Highest local minimum strictly below `level`; lows.min() if there is none."""
+    best = -np.inf
+    for i in range(len(lows)):
+        v = lows[i]
+        if v < level and v > best and _is_extremum(lows, i, order, 1):
+            best = v
+    if best == -np.inf:
+        return lows.min()
+    return best
@@ -0,0 +1,59 @@
+"""
+Ahead-of-time build of the pattern kernels (numba.pycc).
+
+    python -m src.patterns._kernels_build
+
+compiles the hot numba kernels into the native extension
+src/patterns/pattern_kernels*.so. At import time the detectors pick up the
+compiled functions from it (see _numba.aot), so a fresh process – every
+scheduled scan runs on a new CI runner – skips the JIT compilation of these
+kernels entirely. Without the extension the same kernels are JIT-compiled
+with the same signatures at import (_numba.eager).
+
+The extension is a build artifact (not committed); rebuild it whenever a
+kernel listed below changes, otherwise the stale compiled version is used.
+The parallel batch kernel (_scan_abc_batch) is not exported – pycc does not
+support parallel=True – and keeps using the JIT.
+"""
+
+import os
+
+from numba.pycc import CC
+
+from ._extrema import local_extrema, nearest_peak_above, nearest_trough_below
+from ._numba import SIGNATURES
+from .abc_correction import _scan_abc
+from .crosses import _ema_last_two
+from .ichimoku import _ichimoku_last, _ichimoku_signal
+from .rsi_divergence import _rsi_tail, _window_extrema
+
+MODULE_NAME = "pattern_kernels"
+
+# exported name -> (njit kernel, signature); signatures live in _numba.SIGNATURES
+KERNELS = {
+    name: (kernel, SIGNATURES[name])
+    for name, kernel in (
+        ("local_extrema", local_extrema),
+        ("nearest_peak_above", nearest_peak_above),
+        ("nearest_trough_below", nearest_trough_below),
+        ("_ema_last_two", _ema_last_two),
+        ("_ichimoku_last", _ichimoku_last),
+        ("_ichimoku_signal", _ichimoku_signal),
+        ("_rsi_tail", _rsi_tail),
+        ("_window_extrema", _window_extrema),
+        ("_scan_abc", _scan_abc),
+    )
+}
+
+
+def build(output_dir: str = os.path.dirname(os.path.abspath(__file__))) -> None:
+    cc = CC(MODULE_NAME)
+    cc.output_dir = output_dir
+    for name, (kernel, signature) in KERNELS.items():
+        # pycc compiles the plain Python function; kernels it calls stay @njit
+        cc.export(name, signature)(kernel.py_func)
+    cc.compile()
+
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,68 @@
+"""
+Numba shim for the pattern kernels.
+
+With numba installed, `njit` compiles the decorated function to machine code
+(cached on disk between runs). Without it, the same functions run as plain
+Python, so detection keeps working – just slower.
+
+`aot(name)` returns the ahead-of-time compiled version of a kernel from the
+pattern_kernels extension built by _kernels_build, or None when it is not
+built. The extension needs no numba at runtime.
+
+SIGNATURES holds the types of the hot kernels. The AOT build exports them
+with these signatures, and `eager(name)` hands the same signature to @njit
+when the AOT version is missing, so the JIT fallback compiles (or loads from
+the on-disk cache) at import instead of on the first detection.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and parametrized use)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+try:
+    from . import pattern_kernels as _AOT_KERNELS
+except ImportError:
+    _AOT_KERNELS = None
+
+
+def aot(name: str):
+    """AOT-compiled kernel `name`, or None if the extension is not built."""
+    return getattr(_AOT_KERNELS, name, None)
+
+
+# Hot kernels: name -> signature (shared by the AOT build and eager JIT)
+SIGNATURES = {
+    "local_extrema": "i8[:](f8[:], i8, i8, b1)",
+    "nearest_peak_above": "f8(f8[:], f8, i8)",
+    "nearest_trough_below": "f8(f8[:], f8, i8)",
+    "_ema_last_two": "UniTuple(f8, 2)(f8[:], f8)",
+    "_ichimoku_last": "UniTuple(f8, 6)(f8[:], f8[:], i8, i8, i8, i8)",
+    "_ichimoku_signal": "Tuple((i8, f8, b1, b1, b1))(f8, f8, f8, f8, f8, f8, f8, f8)",
+    "_rsi_tail": "f8[:](f8[:], i8, i8)",
+    "_window_extrema": "UniTuple(f8, 8)(f8[:], f8[:], i8)",
+    "_scan_abc": "Tuple((i8, i8, i8, i8, f8))(f8[:], f8[:], i8[:], i8[:], f8, f8, f8, f8, f8, f8, f8)",
+}
+
+
+def eager(name: str) -> tuple:
+    """
+    Positional args for @njit: the kernel's signature when the AOT build does
+    not provide it (compile at import), else nothing (compile lazily – the JIT
+    version then only runs inside other kernels).
+    """
+    if aot(name) is not None:
+        return ()
+    return (SIGNATURES[name],)
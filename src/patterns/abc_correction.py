@@ -34,11 +34,218 @@ Confidence:
     - C nedosáhlo přes minimum/maximum A: +10 (čistý ABC, ne extended)
 """
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
-from scipy.signal import argrelextrema
 
-from .base import BasePattern, PatternResult
+from ._extrema import local_extrema, peaks, troughs
+from ._numba import NUMBA_AVAILABLE, aot, eager, njit, prange
+from .base import BasePattern, ExtremaCache, PatternResult
+
+# Pevné prahy pro confidence a čerstvost signálu – modulové floaty, které numba
+# zkompiluje jako konstanty (žádné čtení atributů za běhu)
+RECENT_BARS = 15               # C musí ležet v posledních N svíčkách
+MAX_PROXIMITY = 0.03           # max vzdálenost aktuální ceny od C
+B_IDEAL_MIN = 0.50             # ideální pásmo B retracementu
+B_IDEAL_MAX = 0.618
+C_IDEAL_MIN = 0.90             # C blízko 100 % délky A
+C_IDEAL_MAX = 1.10
+
+
+@njit(*eager("_scan_abc"), cache=True)
+def _scan_abc(ac_vals, bo_vals, ac_idx, bo_idx, current_close, sign,
+              b_fib_min, b_fib_max, c_len_min, c_len_max, min_move):
+    """
+    Hledá první platnou sekvenci origin → A → B → C.
+
+    Bullish (sign=+1): A/C = troughs (ac_vals = lows), origin/B = peaks (bo_vals = highs).
+    Bearish (sign=-1): A/C = peaks (ac_vals = highs), origin/B = troughs (bo_vals = lows).
+    Vrací (origin, A, B, C, confidence); origin = -1 pokud nic nenalezeno.
+    """
+    n = len(ac_vals)
+    # C musí být v posledních 15 svíčkách (čerstvý signál) – ac_idx je seřazené,
+    # takže platné páry (A, C) tvoří jen konec pole a zbytek se vůbec neprochází
+    start = max(0, np.searchsorted(ac_idx, n - RECENT_BARS) - 1)
+    for i in range(start, len(ac_idx) - 1):
+        a_idx = ac_idx[i]
+        c_idx = ac_idx[i + 1]
+
+        # B = nejnovější extrém mezi A a C, origin = poslední extrém před A
+        b_idx = -1
+        origin_idx = -1
+        for k in range(len(bo_idx) - 1, -1, -1):
+            p = bo_idx[k]
+            if b_idx < 0 and a_idx < p < c_idx:
+                b_idx = p
+            if p < a_idx:
+                origin_idx = p
+                break
+        if b_idx < 0 or origin_idx < 0:
+            continue
+
+        origin_price = bo_vals[origin_idx]
+        price_a = ac_vals[a_idx]
+        price_b = bo_vals[b_idx]
+        price_c = ac_vals[c_idx]
+
+        # Vlna A: pohyb z origin na A
+        wave_a_size = sign * (origin_price - price_a)
+        if wave_a_size <= 0:
+            continue
+
+        # Minimální velikost pohybu
+        if wave_a_size / origin_price < min_move:
+            continue
+
+        # Vlna B: odraz z A na B (B nesmí přesáhnout origin)
+        wave_b_size = sign * (price_b - price_a)
+        if wave_b_size <= 0 or sign * (price_b - origin_price) >= 0:
+            continue
+
+        # B Fibonacci retracement vlny A
+        b_retracement = wave_b_size / wave_a_size
+        if not (b_fib_min <= b_retracement <= b_fib_max):
+            continue
+
+        # Vlna C: pohyb z B na C
+        wave_c_size = sign * (price_b - price_c)
+        if wave_c_size <= 0:
+            continue
+
+        # C délka relativně k A
+        c_to_a_ratio = wave_c_size / wave_a_size
+        if not (c_len_min <= c_to_a_ratio <= c_len_max):
+            continue
+
+        # Aktuální cena musí být blízko C (max 3 % od C)
+        proximity = abs(current_close - price_c) / price_c
+        if proximity > MAX_PROXIMITY:
+            continue
+
+        confidence = 60.0
+
+        # B v ideálním Fibonacci pásmu
+        if B_IDEAL_MIN <= b_retracement <= B_IDEAL_MAX:
+            confidence += 15
+        elif b_fib_min <= b_retracement < B_IDEAL_MIN:
+            confidence += 8
+
+        # C blízko 100 % délky A
+        if C_IDEAL_MIN <= c_to_a_ratio <= C_IDEAL_MAX:
+            confidence += 15
+        elif c_len_min <= c_to_a_ratio < C_IDEAL_MIN:
+            confidence += 8
+
+        # C nepřesáhlo extrém A (čistý ABC)
+        if sign * (price_c - price_a) > 0:
+            confidence += 10
+
+        return origin_idx, a_idx, b_idx, c_idx, min(100.0, confidence)
+
+    return -1, -1, -1, -1, 0.0
+
+
+def _scan_abc_vectorized(ac_vals, bo_vals, ac_idx, bo_idx, current_close, sign,
+                         b_fib_min, b_fib_max, c_len_min, c_len_max, min_move):
+    """
+    NumPy varianta _scan_abc pro prostředí bez numba: všechny páry (A, C)
+    se vyhodnotí najednou jako pole a Python řeší jen první vyhovující pár.
+    Stejné vstupy i výstup jako _scan_abc.
+    """
+    n = len(ac_vals)
+    if len(ac_idx) < 2 or len(bo_idx) == 0:
+        return -1, -1, -1, -1, 0.0
+
+    # Jen páry, kde C leží v posledních RECENT_BARS svíčkách
+    start = max(0, np.searchsorted(ac_idx, n - RECENT_BARS) - 1)
+    a_idx = ac_idx[start:-1]
+    c_idx = ac_idx[start + 1:]
+
+    # B = nejnovější extrém před C (musí ležet za A), origin = poslední extrém před A
+    b_pos = np.searchsorted(bo_idx, c_idx, side="left") - 1
+    o_pos = np.searchsorted(bo_idx, a_idx, side="left") - 1
+    b_ok = b_pos >= 0
+    b_sel = bo_idx[np.maximum(b_pos, 0)]
+    o_sel = bo_idx[np.maximum(o_pos, 0)]
+    mask = b_ok & (b_sel > a_idx) & (o_pos >= 0)
+
+    origin_price = bo_vals[o_sel]
+    price_a = ac_vals[a_idx]
+    price_b = bo_vals[b_sel]
+    price_c = ac_vals[c_idx]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wave_a_size = sign * (origin_price - price_a)
+        wave_b_size = sign * (price_b - price_a)
+        wave_c_size = sign * (price_b - price_c)
+        b_retracement = wave_b_size / wave_a_size
+        c_to_a_ratio = wave_c_size / wave_a_size
+        mask &= (wave_a_size > 0) & (wave_a_size / origin_price >= min_move)
+        mask &= (wave_b_size > 0) & (sign * (price_b - origin_price) < 0)
+        mask &= (b_fib_min <= b_retracement) & (b_retracement <= b_fib_max)
+        mask &= (wave_c_size > 0) & (c_len_min <= c_to_a_ratio) & (c_to_a_ratio <= c_len_max)
+        mask &= np.abs(current_close - price_c) / price_c <= MAX_PROXIMITY
+
+    hits = np.flatnonzero(mask)
+    if len(hits) == 0:
+        return -1, -1, -1, -1, 0.0
+    i = hits[0]
+
+    confidence = 60.0
+    b_ret, c_ratio = b_retracement[i], c_to_a_ratio[i]
+    if B_IDEAL_MIN <= b_ret <= B_IDEAL_MAX:
+        confidence += 15
+    elif b_fib_min <= b_ret < B_IDEAL_MIN:
+        confidence += 8
+    if C_IDEAL_MIN <= c_ratio <= C_IDEAL_MAX:
+        confidence += 15
+    elif c_len_min <= c_ratio < C_IDEAL_MIN:
+        confidence += 8
+    if sign * (price_c[i] - price_a[i]) > 0:
+        confidence += 10
+
+    return int(o_sel[i]), int(a_idx[i]), int(b_sel[i]), int(c_idx[i]), min(100.0, confidence)
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _scan_abc_batch(highs2d, lows2d, closes_last, order,
+                    b_fib_min, b_fib_max, c_len_min, c_len_max, min_move,
+                    out_side, out_idx, out_conf):
+    """
+    _scan_abc pro mnoho symbolů najednou: řádek s = posledních LOOKBACK svíček
+    jednoho symbolu. Symboly běží paralelně (prange, bez GIL).
+    Výstup: out_side (1 bullish, -1 bearish, 0 nic), out_idx (origin, A, B, C), out_conf.
+    """
+    for s in prange(highs2d.shape[0]):
+        highs = highs2d[s]
+        lows = lows2d[s]
+        out_side[s] = 0
+        peak_idx = local_extrema(highs, order, 0, True)
+        trough_idx = local_extrema(lows, order, 1, True)
+        if len(peak_idx) < 2 or len(trough_idx) < 2:
+            continue
+
+        o, a, b, c, conf = _scan_abc(lows, highs, trough_idx, peak_idx, closes_last[s], 1.0,
+                                     b_fib_min, b_fib_max, c_len_min, c_len_max, min_move)
+        side = 1
+        if o < 0:
+            o, a, b, c, conf = _scan_abc(highs, lows, peak_idx, trough_idx, closes_last[s], -1.0,
+                                         b_fib_min, b_fib_max, c_len_min, c_len_max, min_move)
+            side = -1
+        if o < 0:
+            continue
+
+        out_side[s] = side
+        out_idx[s, 0] = o
+        out_idx[s, 1] = a
+        out_idx[s, 2] = b
+        out_idx[s, 3] = c
+        out_conf[s] = conf
+
+
+# AOT build (_kernels_build), jinak kompilovaná smyčka s numba, jinak vektorizovaný NumPy průchod
+_scan = aot("_scan_abc") or (_scan_abc if NUMBA_AVAILABLE else _scan_abc_vectorized)
 
 
 class ABCCorrectionPattern(BasePattern):
@@ -58,18 +265,20 @@ class ABCCorrectionPattern(BasePattern):
     def supported_timeframes(self) -> list[str]:
         return ["4h", "1d"]
 
-    def detect(self, df: pd.DataFrame) -> PatternResult:
+    def detect(self, df: pd.DataFrame, extrema: Optional[ExtremaCache] = None) -> PatternResult:
         if len(df) < self.LOOKBACK + 10:
             return self._not_found()
 
-        data = df.tail(self.LOOKBACK).copy()
-        highs = data["high"].values
-        lows = data["low"].values
-        closes = data["close"].values
+        # Posledních LOOKBACK svíček přímo jako NumPy pole (bez kopie DataFrame)
+        view = ExtremaCache.of(df, extrema)
+        n = min(len(df), self.LOOKBACK)
+        highs = view.highs[-n:]
+        lows = view.lows[-n:]
+        closes = view.closes[-n:]
 
-        # Lokální maxima a minima
-        peak_idx = argrelextrema(highs, np.greater_equal, order=self.ORDER)[0]
-        trough_idx = argrelextrema(lows, np.less_equal, order=self.ORDER)[0]
+        # Lokální maxima a minima (plató = jeden extrém, méně kandidátů pro hledání)
+        peak_idx = peaks(highs, self.ORDER, collapse=True)
+        trough_idx = troughs(lows, self.ORDER, collapse=True)
 
         if len(peak_idx) < 2 or len(trough_idx) < 2:
             return self._not_found()
@@ -78,235 +287,126 @@ class ABCCorrectionPattern(BasePattern):
 
         # --- Bullish ABC ---
         # Sekvence: Peak (origin) → Trough A → Peak B → Trough C (aktuální)
-        result = self._detect_bullish(highs, lows, closes, peak_idx, trough_idx, current_close)
+        result = self._detect_side("bullish", highs, lows, peak_idx, trough_idx, current_close)
         if result.found:
             return result
 
         # --- Bearish ABC ---
         # Sekvence: Trough (origin) → Peak A → Trough B → Peak C (aktuální)
-        result = self._detect_bearish(highs, lows, closes, peak_idx, trough_idx, current_close)
+        result = self._detect_side("bearish", highs, lows, peak_idx, trough_idx, current_close)
         if result.found:
             return result
 
         return self._not_found()
 
-    def _detect_bullish(self, highs, lows, closes, peak_idx, trough_idx, current_close) -> PatternResult:
+    def _detect_side(self, side, highs, lows, peak_idx, trough_idx, current_close) -> PatternResult:
         """
-        Bullish ABC: hledáme peak → trough_A → peak_B → trough_C
-        C vlna = potenciální nákupní příležitost (očekáváme obrat nahoru)
+        Bullish ABC: peak → trough_A → peak_B → trough_C (očekáváme obrat nahoru)
+        Bearish ABC: trough → peak_A → trough_B → peak_C (očekáváme obrat dolů)
+        Samotné hledání běží v _scan (kompilovaný _scan_abc nebo NumPy varianta).
         """
-        # Potřebujeme alespoň 2 troughs a 1 peak mezi nimi
-        for i in range(len(trough_idx) - 1):
-            trough_a_idx = trough_idx[i]
-            trough_c_idx = trough_idx[i + 1]
-
-            # Trough C musí být v posledních 15 svíčkách (čerstvý signál)
-            if trough_c_idx < len(lows) - 15:
-                continue
-
-            # Najdi peak B mezi troughs A a C
-            peaks_between = [p for p in peak_idx if trough_a_idx < p < trough_c_idx]
-            if not peaks_between:
-                continue
-            peak_b_idx = peaks_between[-1]  # Bereme nejnovější peak
-
-            # Najdi origin peak před trough A (pro určení předchozího trendu)
-            peaks_before = [p for p in peak_idx if p < trough_a_idx]
-            if not peaks_before:
-                continue
-            origin_idx = peaks_before[-1]
-
-            # Hodnoty bodů
-            origin_price = float(highs[origin_idx])
-            price_a = float(lows[trough_a_idx])
-            price_b = float(highs[peak_b_idx])
-            price_c = float(lows[trough_c_idx])
-
-            # Vlna A: pokles z origin na A
-            wave_a_size = origin_price - price_a
-            if wave_a_size <= 0:
-                continue
-
-            # Minimální velikost pohybu
-            if wave_a_size / origin_price < self.MIN_MOVE_PCT:
-                continue
-
-            # Vlna B: odraz z A na B (B musí být pod origin)
-            wave_b_size = price_b - price_a
-            if wave_b_size <= 0 or price_b >= origin_price:
-                continue
-
-            # B Fibonacci retracement vlny A
-            b_retracement = wave_b_size / wave_a_size
-            if not (self.B_FIB_MIN <= b_retracement <= self.B_FIB_MAX):
-                continue
-
-            # Vlna C: pokles z B na C
-            wave_c_size = price_b - price_c
-            if wave_c_size <= 0:
-                continue
-
-            # C délka relativně k A
-            c_to_a_ratio = wave_c_size / wave_a_size
-            if not (self.C_LENGTH_MIN <= c_to_a_ratio <= self.C_LENGTH_MAX):
-                continue
-
-            # Aktuální cena musí být blízko C (max 2 % od C minima)
-            proximity = abs(current_close - price_c) / price_c
-            if proximity > 0.03:
-                continue
-
-            # Confidence výpočet
-            confidence = 60.0
-
-            # B v ideálním Fibonacci pásmu
-            if 0.50 <= b_retracement <= 0.618:
-                confidence += 15
-            elif self.B_FIB_MIN <= b_retracement < 0.50:
-                confidence += 8
-
-            # C blízko 100 % délky A
-            if 0.90 <= c_to_a_ratio <= 1.10:
-                confidence += 15
-            elif self.C_LENGTH_MIN <= c_to_a_ratio < 0.90:
-                confidence += 8
-
-            # C nedosáhlo přes minimum A (čistý ABC)
-            if price_c > price_a:
-                confidence += 10
-
-            confidence = min(100.0, confidence)
-
-            # TP = projekce zpět k origin (kde začal pokles)
-            tp_target = origin_price
-
-            return self._result(
-                "bullish",
-                confidence,
-                {
-                    "origin_price": round(origin_price, 4),
-                    "wave_a_price": round(price_a, 4),
-                    "wave_b_price": round(price_b, 4),
-                    "wave_c_price": round(price_c, 4),
-                    "wave_a_size_pct": round(wave_a_size / origin_price * 100, 2),
-                    "b_retracement_pct": round(b_retracement * 100, 2),
-                    "c_to_a_ratio": round(c_to_a_ratio, 3),
-                    "tp_target": round(tp_target, 4),
-                    "support": round(price_c * 0.99, 4),       # SL těsně pod C
-                    "resistance": round(price_b, 4),            # První odpor = B vrchol
-                    "neckline": round(price_b, 4),
-                    "current_close": round(current_close, 4),
-                },
-            )
+        if side == "bullish":
+            ac_vals, bo_vals, ac_idx, bo_idx, sign = lows, highs, trough_idx, peak_idx, 1.0
+        else:
+            ac_vals, bo_vals, ac_idx, bo_idx, sign = highs, lows, peak_idx, trough_idx, -1.0
+
+        origin_idx, a_idx, b_idx, c_idx, confidence = _scan(
+            ac_vals, bo_vals,
+            np.asarray(ac_idx, dtype=np.int64), np.asarray(bo_idx, dtype=np.int64),
+            current_close, sign,
+            self.B_FIB_MIN, self.B_FIB_MAX, self.C_LENGTH_MIN, self.C_LENGTH_MAX, self.MIN_MOVE_PCT,
+        )
+        if origin_idx < 0:
+            return self._not_found()
 
-        return self._not_found()
+        return self._build_result(
+            side, highs, lows, (origin_idx, a_idx, b_idx, c_idx), confidence, current_close
+        )
 
-    def _detect_bearish(self, highs, lows, closes, peak_idx, trough_idx, current_close) -> PatternResult:
+    def detect_many(self, dfs: list[pd.DataFrame]) -> list[PatternResult]:
         """
-        Bearish ABC: hledáme trough → peak_A → trough_B → peak_C
-        C vlna = potenciální prodejní příležitost (očekáváme obrat dolů)
+        Detekce pro mnoho symbolů v jednom paralelním průchodu (_scan_abc_batch).
+        Vrací přesně stejné výsledky jako detect() pro každý DataFrame zvlášť
+        (stejný kernel nad stejnými float64 daty).
         """
-        for i in range(len(peak_idx) - 1):
-            peak_a_idx = peak_idx[i]
-            peak_c_idx = peak_idx[i + 1]
-
-            # Peak C musí být v posledních 15 svíčkách
-            if peak_c_idx < len(highs) - 15:
-                continue
-
-            # Najdi trough B mezi peaks A a C
-            troughs_between = [t for t in trough_idx if peak_a_idx < t < peak_c_idx]
-            if not troughs_between:
-                continue
-            trough_b_idx = troughs_between[-1]
-
-            # Najdi origin trough před peak A
-            troughs_before = [t for t in trough_idx if t < peak_a_idx]
-            if not troughs_before:
-                continue
-            origin_idx = troughs_before[-1]
-
-            # Hodnoty bodů
-            origin_price = float(lows[origin_idx])
-            price_a = float(highs[peak_a_idx])
-            price_b = float(lows[trough_b_idx])
-            price_c = float(highs[peak_c_idx])
-
-            # Vlna A: vzestup z origin na A
-            wave_a_size = price_a - origin_price
-            if wave_a_size <= 0:
-                continue
-
-            # Minimální velikost pohybu
-            if wave_a_size / origin_price < self.MIN_MOVE_PCT:
-                continue
-
-            # Vlna B: pokles z A na B (B musí být nad origin)
-            wave_b_size = price_a - price_b
-            if wave_b_size <= 0 or price_b <= origin_price:
-                continue
-
-            # B Fibonacci retracement vlny A
-            b_retracement = wave_b_size / wave_a_size
-            if not (self.B_FIB_MIN <= b_retracement <= self.B_FIB_MAX):
-                continue
-
-            # Vlna C: vzestup z B na C
-            wave_c_size = price_c - price_b
-            if wave_c_size <= 0:
-                continue
-
-            # C délka relativně k A
-            c_to_a_ratio = wave_c_size / wave_a_size
-            if not (self.C_LENGTH_MIN <= c_to_a_ratio <= self.C_LENGTH_MAX):
-                continue
-
-            # Aktuální cena musí být blízko C (max 3 % od C maxima)
-            proximity = abs(current_close - price_c) / price_c
-            if proximity > 0.03:
-                continue
-
-            # Confidence výpočet
-            confidence = 60.0
-
-            # B v ideálním Fibonacci pásmu
-            if 0.50 <= b_retracement <= 0.618:
-                confidence += 15
-            elif self.B_FIB_MIN <= b_retracement < 0.50:
-                confidence += 8
-
-            # C blízko 100 % délky A
-            if 0.90 <= c_to_a_ratio <= 1.10:
-                confidence += 15
-            elif self.C_LENGTH_MIN <= c_to_a_ratio < 0.90:
-                confidence += 8
-
-            # C nepřesáhlo maximum A (čistý ABC)
-            if price_c < price_a:
-                confidence += 10
-
-            confidence = min(100.0, confidence)
-
-            # TP = projekce zpět k origin (kde začal vzestup)
-            tp_target = origin_price
-
-            return self._result(
-                "bearish",
-                confidence,
-                {
-                    "origin_price": round(origin_price, 4),
-                    "wave_a_price": round(price_a, 4),
-                    "wave_b_price": round(price_b, 4),
-                    "wave_c_price": round(price_c, 4),
-                    "wave_a_size_pct": round(wave_a_size / origin_price * 100, 2),
-                    "b_retracement_pct": round(b_retracement * 100, 2),
-                    "c_to_a_ratio": round(c_to_a_ratio, 3),
-                    "tp_target": round(tp_target, 4),
-                    "support": round(price_b, 4),               # První podpora = B dno
-                    "resistance": round(price_c * 1.01, 4),     # SL těsně nad C
-                    "neckline": round(price_b, 4),
-                    "current_close": round(current_close, 4),
-                },
-            )
-
-        return self._not_found()
+        if not NUMBA_AVAILABLE:
+            return super().detect_many(dfs)
+
+        results = [self._not_found() for _ in dfs]
+        eligible = [i for i, df in enumerate(dfs) if len(df) >= self.LOOKBACK + 10]
+        if not eligible:
+            return results
+
+        # Řádek na symbol: posledních LOOKBACK svíček (všechny mají stejnou délku).
+        # Matice zůstávají ve float64 – výsledky slouží přímo jako výsledky
+        # detekce (main._batch_detect), takže musí souhlasit s detect() i na
+        # hranicích Fibonacci pásem.
+        n = self.LOOKBACK
+        highs64 = [dfs[i]["high"].to_numpy(dtype=np.float64)[-n:] for i in eligible]
+        lows64 = [dfs[i]["low"].to_numpy(dtype=np.float64)[-n:] for i in eligible]
+        highs2d = np.stack(highs64)
+        lows2d = np.stack(lows64)
+        closes_last = np.array([float(dfs[i]["close"].iloc[-1]) for i in eligible])
+
+        out_side = np.zeros(len(eligible), dtype=np.int64)
+        out_idx = np.zeros((len(eligible), 4), dtype=np.int64)
+        out_conf = np.zeros(len(eligible), dtype=np.float64)
+        _scan_abc_batch(
+            highs2d, lows2d, closes_last, self.ORDER,
+            self.B_FIB_MIN, self.B_FIB_MAX, self.C_LENGTH_MIN, self.C_LENGTH_MAX, self.MIN_MOVE_PCT,
+            out_side, out_idx, out_conf,
+        )
+
+        for row, i in enumerate(eligible):
+            if out_side[row] != 0:
+                results[i] = self._build_result(
+                    "bullish" if out_side[row] > 0 else "bearish",
+                    highs64[row], lows64[row], tuple(int(k) for k in out_idx[row]),
+                    out_conf[row], float(closes_last[row]),
+                )
+        return results
+
+    def _build_result(self, side, highs, lows, points, confidence, current_close) -> PatternResult:
+        """PatternResult z nalezených bodů (origin, A, B, C)."""
+        origin_idx, a_idx, b_idx, c_idx = points
+        if side == "bullish":
+            ac_vals, bo_vals, sign = lows, highs, 1.0
+        else:
+            ac_vals, bo_vals, sign = highs, lows, -1.0
+
+        origin_price = float(bo_vals[origin_idx])
+        price_a = float(ac_vals[a_idx])
+        price_b = float(bo_vals[b_idx])
+        price_c = float(ac_vals[c_idx])
+        wave_a_size = sign * (origin_price - price_a)
+        b_retracement = sign * (price_b - price_a) / wave_a_size
+        c_to_a_ratio = sign * (price_b - price_c) / wave_a_size
+
+        # TP = projekce zpět k origin (kde začal pohyb vlny A)
+        tp_target = origin_price
+
+        if side == "bullish":
+            support = price_c * 0.99        # SL těsně pod C
+            resistance = price_b            # První odpor = B vrchol
+        else:
+            support = price_b               # První podpora = B dno
+            resistance = price_c * 1.01     # SL těsně nad C
+
+        return self._result(
+            side,
+            float(confidence),
+            {
+                "origin_price": origin_price,
+                "wave_a_price": price_a,
+                "wave_b_price": price_b,
+                "wave_c_price": price_c,
+                "wave_a_size_pct": wave_a_size / origin_price * 100,
+                "b_retracement_pct": b_retracement * 100,
+                "c_to_a_ratio": c_to_a_ratio,
+                "tp_target": tp_target,
+                "support": support,
+                "resistance": resistance,
+                "neckline": price_b,
+                "current_close": current_close,
+            },
+        )
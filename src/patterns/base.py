@@ -4,26 +4,64 @@ Base class for all pattern detectors.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from functools import cached_property
+from types import MappingProxyType
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
-
-@dataclass
+from ._extrema import peaks, troughs
+
+
+# Decimal places of float detail values once they leave the detector.
+# Prices default to DETAIL_DECIMALS; ratios/percentages use their own precision.
+DETAIL_DECIMALS = 4
+DETAIL_DECIMALS_BY_KEY = {
+    "volume_ratio": 2,
+    "size_ratio": 2,
+    "prior_trend_pct": 2,
+    "pole_move_pct": 2,
+    "channel_width_pct": 2,
+    "wave_a_size_pct": 2,
+    "b_retracement_pct": 2,
+    "c_to_a_ratio": 3,
+    "rsi_low_recent": 2,
+    "rsi_low_past": 2,
+    "rsi_high_recent": 2,
+    "rsi_high_past": 2,
+    "current_rsi": 2,
+    "rising_low_slope": 6,
+    "falling_high_slope": 6,
+}
+
+
+@dataclass(slots=True)
 class PatternResult:
-    """Standardized result returned by every pattern detector."""
+    """
+    Standardized result returned by every pattern detector.
+
+    Detectors store raw floats in `details`; rounding for display/storage is
+    done once in rounded_details() / to_dict().
+    """
     found: bool
     type: str          # 'bullish' | 'bearish' | 'neutral'
     confidence: float  # 0-100
     details: dict = field(default_factory=dict)
     pattern_name: str = ""
 
+    def rounded_details(self) -> dict:
+        return {
+            k: round(float(v), DETAIL_DECIMALS_BY_KEY.get(k, DETAIL_DECIMALS)) if isinstance(v, (float, np.floating)) else v
+            for k, v in self.details.items()
+        }
+
     def to_dict(self) -> dict:
         return {
             "found": self.found,
             "type": self.type,
             "confidence": self.confidence,
-            "details": self.details,
+            "details": self.rounded_details(),
             "pattern_name": self.pattern_name,
         }
 
@@ -31,6 +69,54 @@ class PatternResult:
 NOT_FOUND = PatternResult(found=False, type="neutral", confidence=0.0, details={})
 
 
+@dataclass
+class ExtremaCache:
+    """
+    OHLCV arrays and local extrema of the full series of one scanned frame.
+
+    Built once per scan and handed to every detector, so the column arrays are
+    pulled out of the DataFrame once (not once per detector) and detectors
+    working on the whole frame with the same `order` share one extrema pass.
+    Indices are computed lazily per (order, collapse) and memoized.
+    """
+    opens: np.ndarray
+    highs: np.ndarray
+    lows: np.ndarray
+    closes: np.ndarray
+    volumes: np.ndarray
+    _peaks: dict = field(default_factory=dict, repr=False)
+    _troughs: dict = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_df(cls, df: pd.DataFrame) -> "ExtremaCache":
+        # Per-column to_numpy() of float64 columns returns views of the frame's
+        # block (no copy); selecting all five columns into one 2-D array would copy
+        return cls(
+            opens=df["open"].to_numpy(dtype=np.float64),
+            highs=df["high"].to_numpy(dtype=np.float64),
+            lows=df["low"].to_numpy(dtype=np.float64),
+            closes=df["close"].to_numpy(dtype=np.float64),
+            volumes=df["volume"].to_numpy(dtype=np.float64),
+        )
+
+    @classmethod
+    def of(cls, df: pd.DataFrame, extrema: Optional["ExtremaCache"]) -> "ExtremaCache":
+        """The shared cache when the caller passed one, else a fresh one for `df`."""
+        return extrema if extrema is not None else cls.from_df(df)
+
+    def peak_idx(self, order: int, collapse: bool = False) -> np.ndarray:
+        idx = self._peaks.get((order, collapse))
+        if idx is None:
+            idx = self._peaks[(order, collapse)] = peaks(self.highs, order, collapse)
+        return idx
+
+    def trough_idx(self, order: int, collapse: bool = False) -> np.ndarray:
+        idx = self._troughs.get((order, collapse))
+        if idx is None:
+            idx = self._troughs[(order, collapse)] = troughs(self.lows, order, collapse)
+        return idx
+
+
 class BasePattern(ABC):
     """
     Abstract base class for pattern detectors.
@@ -52,30 +138,45 @@ class BasePattern(ABC):
         """List of timeframes this detector supports, e.g. ['4h', '1d']."""
 
     @abstractmethod
-    def detect(self, df: pd.DataFrame) -> PatternResult:
+    def detect(self, df: pd.DataFrame, extrema: Optional[ExtremaCache] = None) -> PatternResult:
         """
         Run pattern detection on a normalized OHLCV DataFrame.
 
         Args:
             df: DataFrame with columns [open, high, low, close, volume]
                 indexed by UTC datetime.
+            extrema: optional shared arrays/extrema of `df` (see ExtremaCache);
+                detectors build their own when it is None.
 
         Returns:
             PatternResult instance.
         """
 
+    def detect_many(self, dfs: list[pd.DataFrame]) -> list[PatternResult]:
+        """
+        Run detect() on many frames (e.g. all symbols of one scan).
+        Detectors with a batched kernel override this; results are in input order.
+        """
+        return [self.detect(df) for df in dfs]
+
     def supports_timeframe(self, timeframe: str) -> bool:
         return timeframe in self.supported_timeframes
 
-    def _not_found(self) -> PatternResult:
+    @cached_property
+    def _not_found_result(self) -> PatternResult:
+        # Shared by every miss of this detector; details is read-only so the
+        # instance cannot be mutated by one caller and leak into the next.
         return PatternResult(
             found=False,
             type="neutral",
             confidence=0.0,
-            details={},
+            details=MappingProxyType({}),
             pattern_name=self.name,
         )
 
+    def _not_found(self) -> PatternResult:
+        return self._not_found_result
+
     def _result(
         self,
         signal_type: str,
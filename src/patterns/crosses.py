@@ -11,33 +11,46 @@ Podpora a odpor:
 - Death Cross (bearish): odpor = EMA200 (dynamický odpor), podpora = nejbližší swing low POD cenou
 """
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
-from scipy.signal import argrelextrema
-
-from .base import BasePattern, PatternResult
-
 
-def _nearest_swing_high(df: pd.DataFrame, current_close: float, lookback: int = 100) -> float:
+from ._extrema import nearest_peak_above, nearest_trough_below
+from ._numba import aot, eager, njit
+from .base import BasePattern, ExtremaCache, PatternResult
+
+@njit(*eager("_ema_last_two"), cache=True)
+def _ema_last_two(x, alpha):
+    """
+    EMA (adjust=False) at the last two positions of `x`, as a scalar recurrence.
+    Uses the same update as pandas' ewm, ((1-a)*e + a*x) / ((1-a) + a), so the
+    values are bit-identical to closes.ewm(span, adjust=False).mean()[-2:].
+    """
+    e = x[0]
+    prev = e
+    for t in range(1, len(x)):
+        prev = e
+        cur = x[t]
+        if e != cur:
+            e = ((1.0 - alpha) * e + alpha * cur) / ((1.0 - alpha) + alpha)
+    return prev, e
+
+
+# AOT builds of the kernels when present (see _kernels_build), else the JIT ones
+_ema_last_two_fn = aot("_ema_last_two") or _ema_last_two
+_nearest_peak_above = aot("nearest_peak_above") or nearest_peak_above
+_nearest_trough_below = aot("nearest_trough_below") or nearest_trough_below
+
+
+def _nearest_swing_high(highs: np.ndarray, current_close: float, lookback: int = 100) -> float:
     """Nejbližší swing high NAD aktuální cenou z posledních `lookback` svíček."""
-    window = df.tail(lookback)
-    highs = window["high"].values
-    peak_idx = argrelextrema(highs, np.greater_equal, order=5)[0]
-    above = [highs[i] for i in peak_idx if highs[i] > current_close]
-    if above:
-        return float(min(above))
-    return float(highs.max())
+    return float(_nearest_peak_above(highs[-lookback:], current_close, 5))
 
 
-def _nearest_swing_low(df: pd.DataFrame, current_close: float, lookback: int = 100) -> float:
+def _nearest_swing_low(lows: np.ndarray, current_close: float, lookback: int = 100) -> float:
     """Nejbližší swing low POD aktuální cenou z posledních `lookback` svíček."""
-    window = df.tail(lookback)
-    lows = window["low"].values
-    trough_idx = argrelextrema(lows, np.less_equal, order=5)[0]
-    below = [lows[i] for i in trough_idx if lows[i] < current_close]
-    if below:
-        return float(max(below))
-    return float(lows.min())
+    return float(_nearest_trough_below(lows[-lookback:], current_close, 5))
 
 
 class CrossesPattern(BasePattern):
@@ -53,76 +66,85 @@ class CrossesPattern(BasePattern):
     def supported_timeframes(self) -> list[str]:
         return ["1d"]
 
-    def detect(self, df: pd.DataFrame) -> PatternResult:
+    def _emas(self, df: pd.DataFrame, closes: np.ndarray) -> tuple[float, float, float, float]:
+        """
+        EMA50/EMA200 at the previous and the current candle, computed over the
+        whole frame by the compiled _ema_last_two (same values as pandas ewm).
+        Stateless on purpose: the result depends only on the frame, never on
+        what an earlier scan in the same process saw.
+        """
+        if np.isnan(closes).any():
+            # ewm skips gaps (NaN) with its own weighting – leave those to pandas
+            series = df["close"]
+            ema_fast = series.ewm(span=self.EMA_FAST, adjust=False).mean().to_numpy()
+            ema_slow = series.ewm(span=self.EMA_SLOW, adjust=False).mean().to_numpy()
+            return float(ema_fast[-2]), float(ema_slow[-2]), float(ema_fast[-1]), float(ema_slow[-1])
+
+        prev_fast, curr_fast = _ema_last_two_fn(closes, 2 / (self.EMA_FAST + 1))
+        prev_slow, curr_slow = _ema_last_two_fn(closes, 2 / (self.EMA_SLOW + 1))
+        return prev_fast, prev_slow, curr_fast, curr_slow
+
+    def detect(self, df: pd.DataFrame, extrema: Optional[ExtremaCache] = None) -> PatternResult:
         required = self.EMA_SLOW + 10
         if len(df) < required:
             return self._not_found()
 
-        closes = df["close"]
-        volumes = df["volume"]
+        # Raw arrays once – plain ndarray indexing instead of Series.iloc per access
+        view = ExtremaCache.of(df, extrema)
+        closes = view.closes
+        volumes = view.volumes
 
-        ema_fast = closes.ewm(span=self.EMA_FAST, adjust=False).mean()
-        ema_slow = closes.ewm(span=self.EMA_SLOW, adjust=False).mean()
+        prev_fast, prev_slow, curr_fast, curr_slow = self._emas(df, closes)
 
-        prev_diff = ema_fast.iloc[-2] - ema_slow.iloc[-2]
-        curr_diff = ema_fast.iloc[-1] - ema_slow.iloc[-1]
+        prev_diff = prev_fast - prev_slow
+        curr_diff = curr_fast - curr_slow
 
-        # Detect crossover
-        crossed = (prev_diff < 0 and curr_diff > 0) or (prev_diff > 0 and curr_diff < 0)
-        if not crossed:
+        # Detect crossover: the EMA spread changed sign (NaN never counts as a cross)
+        if not prev_diff * curr_diff < 0:
             return self._not_found()
+        is_golden = curr_diff > 0
 
         # Volume confirmation
-        avg_volume = volumes.iloc[-21:-1].mean()
-        cross_volume = volumes.iloc[-1]
+        avg_volume = volumes[-21:-1].mean()
+        cross_volume = volumes[-1]
         volume_ratio = cross_volume / avg_volume if avg_volume > 0 else 0
         volume_confirmed = volume_ratio >= self.VOLUME_MULTIPLIER
 
-        current_close = float(closes.iloc[-1])
-        ema50_val = float(ema_fast.iloc[-1])
-        ema200_val = float(ema_slow.iloc[-1])
+        current_close = float(closes[-1])
+        ema50_val = float(curr_fast)
+        ema200_val = float(curr_slow)
 
         base_confidence = 65
         volume_bonus = min(15, (volume_ratio - 1) * 30) if volume_confirmed else 0
-        separation = abs(curr_diff) / ema_slow.iloc[-1] * 100
+        separation = abs(curr_diff) / curr_slow * 100
         separation_bonus = min(10, separation * 20)
         confidence = min(100, base_confidence + volume_bonus + separation_bonus)
 
-        if prev_diff < 0 and curr_diff > 0:
+        ema200_level = ema200_val
+        if is_golden:
             # Golden Cross
             # Podpora = EMA200 (klasická dynamická podpora po Golden Cross)
             # Odpor = nejbližší swing high NAD cenou (reálná TA úroveň)
-            resistance_level = round(_nearest_swing_high(df, current_close), 4)
-            return self._result(
-                "bullish",
-                confidence,
-                {
-                    "ema50": round(ema50_val, 4),
-                    "ema200": round(ema200_val, 4),
-                    "volume_ratio": round(volume_ratio, 2),
-                    "volume_confirmed": volume_confirmed,
-                    "support": round(ema200_val, 4),
-                    "resistance": resistance_level,
-                    "current_close": round(current_close, 4),
-                    "cross_type": "golden",
-                },
-            )
+            support = ema200_level
+            resistance = _nearest_swing_high(view.highs, current_close)
         else:
             # Death Cross
             # Odpor = EMA200 (klasický dynamický odpor po Death Cross)
             # Podpora = nejbližší swing low POD cenou (reálná TA úroveň)
-            support_level = round(_nearest_swing_low(df, current_close), 4)
-            return self._result(
-                "bearish",
-                confidence,
-                {
-                    "ema50": round(ema50_val, 4),
-                    "ema200": round(ema200_val, 4),
-                    "volume_ratio": round(volume_ratio, 2),
-                    "volume_confirmed": volume_confirmed,
-                    "support": support_level,
-                    "resistance": round(ema200_val, 4),
-                    "current_close": round(current_close, 4),
-                    "cross_type": "death",
-                },
-            )
+            support = _nearest_swing_low(view.lows, current_close)
+            resistance = ema200_level
+
+        return self._result(
+            "bullish" if is_golden else "bearish",
+            confidence,
+            {
+                "ema50": ema50_val,
+                "ema200": ema200_level,
+                "volume_ratio": volume_ratio,
+                "volume_confirmed": volume_confirmed,
+                "support": support,
+                "resistance": resistance,
+                "current_close": current_close,
+                "cross_type": "golden" if is_golden else "death",
+            },
+        )
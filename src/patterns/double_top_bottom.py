@@ -7,11 +7,12 @@ Logic:
 - Confirm breakout through the neckline.
 """
 
-import numpy as np
+from typing import Optional
+
 import pandas as pd
-from scipy.signal import argrelextrema
 
-from .base import BasePattern, PatternResult
+from ._extrema import between
+from .base import BasePattern, ExtremaCache, PatternResult
 
 
 class DoubleTopBottomPattern(BasePattern):
@@ -25,18 +26,21 @@ class DoubleTopBottomPattern(BasePattern):
     def supported_timeframes(self) -> list[str]:
         return ["1h", "4h", "1d"]
 
-    def detect(self, df: pd.DataFrame) -> PatternResult:
+    def detect(self, df: pd.DataFrame, extrema: Optional[ExtremaCache] = None) -> PatternResult:
         if len(df) < 30:
             return self._not_found()
 
-        closes = df["close"].values
-        highs = df["high"].values
-        lows = df["low"].values
+        view = ExtremaCache.of(df, extrema)
+        closes = view.closes
+        highs = view.highs
+        lows = view.lows
 
         # Find local maxima and minima (order=5: at least 5 bars on each side)
         order = 5
-        peak_idx = argrelextrema(highs, np.greater_equal, order=order)[0]
-        trough_idx = argrelextrema(lows, np.less_equal, order=order)[0]
+        # Flat tops/bottoms count once – otherwise two adjacent bars of one
+        # plateau would pass as the two peaks of a double top
+        peak_idx = view.peak_idx(order, collapse=True)
+        trough_idx = view.trough_idx(order, collapse=True)
 
         # --- Double Top ---
         result = self._check_double_top(highs, lows, closes, peak_idx, trough_idx, df)
@@ -56,13 +60,15 @@ class DoubleTopBottomPattern(BasePattern):
         p1, p2 = highs[p1_i], highs[p2_i]
 
         # Check peaks are within tolerance
-        avg_peak = (p1 + p2) / 2
-        if abs(p1 - p2) / avg_peak > self.TOLERANCE:
+        # Tolerance check without a divide: |a-b| / ((a+b)/2) > tol  <=>  2|a-b| > tol*(a+b)
+        diff = abs(p1 - p2)
+        sum2 = p1 + p2
+        if 2 * diff > self.TOLERANCE * sum2:
             return self._not_found()
 
         # Find a trough between the two peaks
-        troughs_between = [t for t in trough_idx if p1_i < t < p2_i]
-        if not troughs_between:
+        troughs_between = between(trough_idx, p1_i, p2_i)
+        if len(troughs_between) == 0:
             return self._not_found()
 
         neckline = lows[troughs_between[0]]
@@ -73,7 +79,7 @@ class DoubleTopBottomPattern(BasePattern):
             return self._not_found()
 
         # Calculate confidence
-        peak_similarity = 1 - abs(p1 - p2) / avg_peak / self.TOLERANCE
+        peak_similarity = 1 - 2 * diff / (sum2 * self.TOLERANCE)
         break_depth = (neckline - current_close) / neckline
         confidence = min(100, 60 + peak_similarity * 20 + min(break_depth * 200, 20))
 
@@ -88,16 +94,16 @@ class DoubleTopBottomPattern(BasePattern):
             "bearish",
             confidence,
             {
-                "peak1": round(float(p1), 4),
-                "peak2": round(float(p2), 4),
+                "peak1": float(p1),
+                "peak2": float(p2),
                 "peak1_bar": int(p1_i),
                 "peak2_bar": int(p2_i),
                 "peak1_ts": ts1,   # timestamp svíčky 1. vrcholu
                 "peak2_ts": ts2,   # timestamp svíčky 2. vrcholu
-                "neckline": round(float(neckline), 4),
-                "current_close": round(float(current_close), 4),
-                "support": round(float(neckline), 4),
-                "resistance": round(float(avg_peak), 4),
+                "neckline": float(neckline),
+                "current_close": float(current_close),
+                "support": float(neckline),
+                "resistance": float(sum2 / 2),
             },
         )
 
@@ -108,13 +114,15 @@ class DoubleTopBottomPattern(BasePattern):
         t1_i, t2_i = trough_idx[-2], trough_idx[-1]
         t1, t2 = lows[t1_i], lows[t2_i]
 
-        avg_trough = (t1 + t2) / 2
-        if abs(t1 - t2) / avg_trough > self.TOLERANCE:
+        # Tolerance check without a divide: |a-b| / ((a+b)/2) > tol  <=>  2|a-b| > tol*(a+b)
+        diff = abs(t1 - t2)
+        sum2 = t1 + t2
+        if 2 * diff > self.TOLERANCE * sum2:
             return self._not_found()
 
         # Find a peak between the two troughs (neckline)
-        peaks_between = [p for p in peak_idx if t1_i < p < t2_i]
-        if not peaks_between:
+        peaks_between = between(peak_idx, t1_i, t2_i)
+        if len(peaks_between) == 0:
             return self._not_found()
 
         neckline = highs[peaks_between[0]]
@@ -124,7 +132,7 @@ class DoubleTopBottomPattern(BasePattern):
         if current_close <= neckline:
             return self._not_found()
 
-        trough_similarity = 1 - abs(t1 - t2) / avg_trough / self.TOLERANCE
+        trough_similarity = 1 - 2 * diff / (sum2 * self.TOLERANCE)
         break_height = (current_close - neckline) / neckline
         confidence = min(100, 60 + trough_similarity * 20 + min(break_height * 200, 20))
 
@@ -139,15 +147,15 @@ class DoubleTopBottomPattern(BasePattern):
             "bullish",
             confidence,
             {
-                "trough1": round(float(t1), 4),
-                "trough2": round(float(t2), 4),
+                "trough1": float(t1),
+                "trough2": float(t2),
                 "trough1_bar": int(t1_i),
                 "trough2_bar": int(t2_i),
                 "trough1_ts": ts1,   # timestamp svíčky 1. dna
                 "trough2_ts": ts2,   # timestamp svíčky 2. dna
-                "neckline": round(float(neckline), 4),
-                "current_close": round(float(current_close), 4),
-                "support": round(float(avg_trough), 4),
-                "resistance": round(float(neckline), 4),
+                "neckline": float(neckline),
+                "current_close": float(current_close),
+                "support": float(sum2 / 2),
+                "resistance": float(neckline),
             },
         )
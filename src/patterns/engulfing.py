@@ -16,39 +16,34 @@ Podpora a odpor jsou odvozeny ze skutečných swing high/low z posledních N sv
 - Podpora (bearish): nejbližší lokální minimum POD aktuální cenou (kde může hledat dno)
 """
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
-from scipy.signal import argrelextrema
 
-from .base import BasePattern, PatternResult
+from ._extrema import nearest_peak_above, nearest_trough_below
+from ._numba import aot
+from .base import BasePattern, ExtremaCache, PatternResult
+
+# AOT builds of the kernels when present (see _kernels_build), else the JIT ones
+_nearest_peak_above = aot("nearest_peak_above") or nearest_peak_above
+_nearest_trough_below = aot("nearest_trough_below") or nearest_trough_below
 
 
-def _nearest_swing_high(df: pd.DataFrame, current_close: float, lookback: int = 50) -> float:
+def _nearest_swing_high(highs: np.ndarray, current_close: float, lookback: int = 50) -> float:
     """
     Vrátí nejbližší swing high NAD aktuální cenou z posledních `lookback` svíček.
     Pokud žádný neexistuje, vrátí nejvyšší high z okna.
     """
-    window = df.tail(lookback)
-    highs = window["high"].values
-    peak_idx = argrelextrema(highs, np.greater_equal, order=3)[0]
-    above = [highs[i] for i in peak_idx if highs[i] > current_close]
-    if above:
-        return float(min(above))  # nejbližší nad cenou
-    return float(highs.max())
+    return float(_nearest_peak_above(highs[-lookback:], current_close, 3))
 
 
-def _nearest_swing_low(df: pd.DataFrame, current_close: float, lookback: int = 50) -> float:
+def _nearest_swing_low(lows: np.ndarray, current_close: float, lookback: int = 50) -> float:
     """
     Vrátí nejbližší swing low POD aktuální cenou z posledních `lookback` svíček.
     Pokud žádný neexistuje, vrátí nejnižší low z okna.
     """
-    window = df.tail(lookback)
-    lows = window["low"].values
-    trough_idx = argrelextrema(lows, np.less_equal, order=3)[0]
-    below = [lows[i] for i in trough_idx if lows[i] < current_close]
-    if below:
-        return float(max(below))  # nejbližší pod cenou
-    return float(lows.min())
+    return float(_nearest_trough_below(lows[-lookback:], current_close, 3))
 
 
 class EngulfingPattern(BasePattern):
@@ -63,40 +58,43 @@ class EngulfingPattern(BasePattern):
     def supported_timeframes(self) -> list[str]:
         return ["4h", "1d"]
 
-    def detect(self, df: pd.DataFrame) -> PatternResult:
+    def detect(self, df: pd.DataFrame, extrema: Optional[ExtremaCache] = None) -> PatternResult:
         if len(df) < self.TREND_LOOKBACK + 2:
             return self._not_found()
 
-        prev = df.iloc[-2]
-        curr = df.iloc[-1]
-
-        prev_body = prev["close"] - prev["open"]
-        curr_body = curr["close"] - curr["open"]
+        # Plain floats from the shared arrays – no per-field pandas row lookups
+        view = ExtremaCache.of(df, extrema)
+        closes = view.closes
+        prev_open, prev_close = float(view.opens[-2]), float(closes[-2])
+        curr_open, current_close = float(view.opens[-1]), float(closes[-1])
 
-        prev_body_size = abs(prev_body)
-        curr_body_size = abs(curr_body)
+        prev_body = prev_close - prev_open
+        curr_body = current_close - curr_open
 
-        if prev_body_size == 0 or curr_body_size == 0:
+        # Opposite-coloured candles (a zero body never qualifies) – the cheapest
+        # test and the one most bars fail, so it runs before anything else
+        if not (prev_body < 0 < curr_body or prev_body > 0 > curr_body):
             return self._not_found()
 
-        # Engulfing: current body must fully contain previous body
-        prev_top = max(prev["open"], prev["close"])
-        prev_bot = min(prev["open"], prev["close"])
-        curr_top = max(curr["open"], curr["close"])
-        curr_bot = min(curr["open"], curr["close"])
+        # Engulfing: current body must fully contain previous body.
+        # Candle colours are known now, so body top/bottom are picked, not compared
+        if prev_body < 0:
+            prev_top, prev_bot = prev_open, prev_close
+            curr_top, curr_bot = current_close, curr_open
+        else:
+            prev_top, prev_bot = prev_close, prev_open
+            curr_top, curr_bot = curr_open, current_close
 
         fully_engulfs = curr_top >= prev_top and curr_bot <= prev_bot
         if not fully_engulfs:
             return self._not_found()
 
         # Size ratio for confidence
-        size_ratio = curr_body_size / prev_body_size
+        size_ratio = abs(curr_body) / abs(prev_body)
 
-        # Prior trend confirmation
-        trend_prices = df["close"].iloc[-(self.TREND_LOOKBACK + 2):-2]
-        trend_slope = (trend_prices.iloc[-1] - trend_prices.iloc[0]) / trend_prices.iloc[0]
-
-        current_close = float(curr["close"])
+        # Prior trend confirmation (only reached by an actual engulfing candle)
+        trend_start = float(closes[-(self.TREND_LOOKBACK + 2)])
+        trend_slope = (float(closes[-3]) - trend_start) / trend_start
 
         # Bullish Engulfing: previous bearish, current bullish
         if prev_body < 0 and curr_body > 0:
@@ -106,23 +104,23 @@ class EngulfingPattern(BasePattern):
             confidence = min(100, 60 + trend_bonus + size_bonus)
 
             # Podpora = spodek engulfing svíčky (skutečné dno vzoru)
-            support_level = round(float(curr_bot), 4)
+            support_level = float(curr_bot)
             # Odpor = nejbližší swing high NAD cenou (skutečná TA úroveň)
-            resistance_level = round(_nearest_swing_high(df, current_close), 4)
+            resistance_level = _nearest_swing_high(view.highs, current_close)
 
             return self._result(
                 "bullish",
                 confidence,
                 {
-                    "prev_open": round(float(prev["open"]), 4),
-                    "prev_close": round(float(prev["close"]), 4),
-                    "curr_open": round(float(curr["open"]), 4),
-                    "curr_close": round(float(current_close), 4),
-                    "size_ratio": round(size_ratio, 2),
-                    "prior_trend_pct": round(trend_slope * 100, 2),
+                    "prev_open": prev_open,
+                    "prev_close": prev_close,
+                    "curr_open": curr_open,
+                    "curr_close": current_close,
+                    "size_ratio": size_ratio,
+                    "prior_trend_pct": trend_slope * 100,
                     "support": support_level,
                     "resistance": resistance_level,
-                    "current_close": round(current_close, 4),
+                    "current_close": current_close,
                 },
             )
 
@@ -133,24 +131,53 @@ class EngulfingPattern(BasePattern):
             confidence = min(100, 60 + trend_bonus + size_bonus)
 
             # Odpor = vršek engulfing svíčky (skutečný strop vzoru)
-            resistance_level = round(float(curr_top), 4)
+            resistance_level = float(curr_top)
             # Podpora = nejbližší swing low POD cenou (skutečná TA úroveň)
-            support_level = round(_nearest_swing_low(df, current_close), 4)
+            support_level = _nearest_swing_low(view.lows, current_close)
 
             return self._result(
                 "bearish",
                 confidence,
                 {
-                    "prev_open": round(float(prev["open"]), 4),
-                    "prev_close": round(float(prev["close"]), 4),
-                    "curr_open": round(float(curr["open"]), 4),
-                    "curr_close": round(float(current_close), 4),
-                    "size_ratio": round(size_ratio, 2),
-                    "prior_trend_pct": round(trend_slope * 100, 2),
+                    "prev_open": prev_open,
+                    "prev_close": prev_close,
+                    "curr_open": curr_open,
+                    "curr_close": current_close,
+                    "size_ratio": size_ratio,
+                    "prior_trend_pct": trend_slope * 100,
                     "support": support_level,
                     "resistance": resistance_level,
-                    "current_close": round(current_close, 4),
+                    "current_close": current_close,
                 },
             )
 
         return self._not_found()
+
+    def detect_many(self, dfs: list[pd.DataFrame]) -> list[PatternResult]:
+        """
+        Vectorized pre-filter over all symbols: the two-candle engulfing rule is
+        evaluated on (M, 2) open/close arrays at once, and detect() runs only for
+        the few frames that pass it. Results are identical to per-frame detect().
+        """
+        results = [self._not_found() for _ in dfs]
+        eligible = [i for i, df in enumerate(dfs) if len(df) >= self.TREND_LOOKBACK + 2]
+        if not eligible:
+            return results
+
+        opens = np.array([dfs[i]["open"].to_numpy(dtype=np.float64)[-2:] for i in eligible])
+        closes = np.array([dfs[i]["close"].to_numpy(dtype=np.float64)[-2:] for i in eligible])
+        bodies = closes - opens
+        prev_body, curr_body = bodies[:, 0], bodies[:, 1]
+
+        # Opposite-coloured candles, current body containing the previous one
+        prev_top = np.maximum(opens[:, 0], closes[:, 0])
+        prev_bot = np.minimum(opens[:, 0], closes[:, 0])
+        curr_top = np.maximum(opens[:, 1], closes[:, 1])
+        curr_bot = np.minimum(opens[:, 1], closes[:, 1])
+        opposite = ((prev_body < 0) & (curr_body > 0)) | ((prev_body > 0) & (curr_body < 0))
+        mask = opposite & (curr_top >= prev_top) & (curr_bot <= prev_bot)
+
+        for row in np.flatnonzero(mask):
+            i = eligible[row]
+            results[i] = self.detect(dfs[i])
+        return results
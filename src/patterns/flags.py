@@ -9,10 +9,12 @@ Logic (Bull Flag):
 Bear Flag is the mirror image.
 """
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
-from .base import BasePattern, PatternResult
+from .base import BasePattern, ExtremaCache, PatternResult
 
 
 class FlagsPattern(BasePattern):
@@ -29,36 +31,44 @@ class FlagsPattern(BasePattern):
     def supported_timeframes(self) -> list[str]:
         return ["1h", "4h", "1d"]
 
-    def detect(self, df: pd.DataFrame) -> PatternResult:
+    def detect(self, df: pd.DataFrame, extrema: Optional[ExtremaCache] = None) -> PatternResult:
         min_bars = self.POLE_BARS + self.CONSOLIDATION_BARS + 2
         if len(df) < min_bars:
             return self._not_found()
 
-        # Split recent data into pole + consolidation
-        consol = df.iloc[-(self.CONSOLIDATION_BARS):]
-        pole_end_idx = len(df) - self.CONSOLIDATION_BARS
-        pole = df.iloc[max(0, pole_end_idx - self.POLE_BARS): pole_end_idx]
+        # Split recent data into pole + consolidation (positions into the shared arrays)
+        view = ExtremaCache.of(df, extrema)
+        closes = view.closes
+        consol_start = len(df) - self.CONSOLIDATION_BARS
+        pole_start = max(0, consol_start - self.POLE_BARS)
 
-        if len(pole) < self.POLE_BARS:
+        if consol_start - pole_start < self.POLE_BARS:
             return self._not_found()
 
-        pole_open = pole["close"].iloc[0]
-        pole_close = pole["close"].iloc[-1]
+        pole_open = closes[pole_start]
+        pole_close = closes[consol_start - 1]
         pole_move = (pole_close - pole_open) / pole_open
 
+        # No impulse, no flag – the common case, rejected before any channel math
+        if not abs(pole_move) > self.IMPULSE_THRESHOLD:
+            return self._not_found()
+
         # Consolidation channel width
-        consol_high = consol["high"].max()
-        consol_low = consol["low"].min()
+        consol_high = view.highs[consol_start:].max()
+        consol_low = view.lows[consol_start:].min()
         channel_mid = (consol_high + consol_low) / 2
         channel_width = (consol_high - consol_low) / channel_mid if channel_mid > 0 else 1
 
+        if not channel_width < self.CHANNEL_WIDTH_MAX:
+            return self._not_found()
+
         # Channel slope (close trend during consolidation)
-        consol_slope = (consol["close"].iloc[-1] - consol["close"].iloc[0]) / consol["close"].iloc[0]
+        consol_slope = (closes[-1] - closes[consol_start]) / closes[consol_start]
 
-        current_close = df["close"].iloc[-1]
+        current_close = closes[-1]
 
         # --- Bull Flag ---
-        if pole_move > self.IMPULSE_THRESHOLD and channel_width < self.CHANNEL_WIDTH_MAX:
+        if pole_move > self.IMPULSE_THRESHOLD:
             # Slope should be neutral or slightly negative (flag dips a bit)
             if consol_slope > 0.01:
                 return self._not_found()
@@ -71,18 +81,18 @@ class FlagsPattern(BasePattern):
                 "bullish",
                 confidence,
                 {
-                    "pole_move_pct": round(pole_move * 100, 2),
-                    "channel_width_pct": round(channel_width * 100, 2),
-                    "pole_start": round(float(pole_open), 4),
-                    "pole_end": round(float(pole_close), 4),
-                    "support": round(float(consol_low), 4),
-                    "resistance": round(float(consol_high), 4),
-                    "current_close": round(float(current_close), 4),
+                    "pole_move_pct": pole_move * 100,
+                    "channel_width_pct": channel_width * 100,
+                    "pole_start": float(pole_open),
+                    "pole_end": float(pole_close),
+                    "support": float(consol_low),
+                    "resistance": float(consol_high),
+                    "current_close": float(current_close),
                 },
             )
 
         # --- Bear Flag ---
-        if pole_move < -self.IMPULSE_THRESHOLD and channel_width < self.CHANNEL_WIDTH_MAX:
+        if pole_move < -self.IMPULSE_THRESHOLD:
             if consol_slope < -0.01:
                 return self._not_found()
 
@@ -94,13 +104,13 @@ class FlagsPattern(BasePattern):
                 "bearish",
                 confidence,
                 {
-                    "pole_move_pct": round(pole_move * 100, 2),
-                    "channel_width_pct": round(channel_width * 100, 2),
-                    "pole_start": round(float(pole_open), 4),
-                    "pole_end": round(float(pole_close), 4),
-                    "support": round(float(consol_low), 4),
-                    "resistance": round(float(consol_high), 4),
-                    "current_close": round(float(current_close), 4),
+                    "pole_move_pct": pole_move * 100,
+                    "channel_width_pct": channel_width * 100,
+                    "pole_start": float(pole_open),
+                    "pole_end": float(pole_close),
+                    "support": float(consol_low),
+                    "resistance": float(consol_high),
+                    "current_close": float(current_close),
                 },
             )
 
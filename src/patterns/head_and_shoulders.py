@@ -10,11 +10,12 @@ Logic (H&S):
 Inverse H&S is the mirror image (three troughs, middle is lowest).
 """
 
-import numpy as np
+from typing import Optional
+
 import pandas as pd
-from scipy.signal import argrelextrema
 
-from .base import BasePattern, PatternResult
+from ._extrema import between
+from .base import BasePattern, ExtremaCache, PatternResult
 
 
 class HeadAndShouldersPattern(BasePattern):
@@ -28,17 +29,21 @@ class HeadAndShouldersPattern(BasePattern):
     def supported_timeframes(self) -> list[str]:
         return ["4h", "1d"]
 
-    def detect(self, df: pd.DataFrame) -> PatternResult:
+    def detect(self, df: pd.DataFrame, extrema: Optional[ExtremaCache] = None) -> PatternResult:
         if len(df) < 40:
             return self._not_found()
 
-        highs = df["high"].values
-        lows = df["low"].values
-        closes = df["close"].values
+        view = ExtremaCache.of(df, extrema)
+        highs = view.highs
+        lows = view.lows
+        closes = view.closes
 
         order = 5
-        peak_idx = argrelextrema(highs, np.greater_equal, order=order)[0]
-        trough_idx = argrelextrema(lows, np.less_equal, order=order)[0]
+        # Flat tops/bottoms count once – a plateau must not pass as two adjacent
+        # shoulders/head. Same (order, collapse) as double top/bottom, so both
+        # detectors share one cached extrema pass
+        peak_idx = view.peak_idx(order, collapse=True)
+        trough_idx = view.trough_idx(order, collapse=True)
 
         result = self._check_hs(highs, lows, closes, peak_idx, trough_idx, df)
         if result.found:
@@ -64,9 +69,9 @@ class HeadAndShouldersPattern(BasePattern):
             return self._not_found()
 
         # Find troughs between ls-head and head-rs for neckline
-        t1_candidates = [t for t in trough_idx if ls_i < t < head_i]
-        t2_candidates = [t for t in trough_idx if head_i < t < rs_i]
-        if not t1_candidates or not t2_candidates:
+        t1_candidates = between(trough_idx, ls_i, head_i)
+        t2_candidates = between(trough_idx, head_i, rs_i)
+        if len(t1_candidates) == 0 or len(t2_candidates) == 0:
             return self._not_found()
 
         t1 = lows[t1_candidates[-1]]
@@ -94,19 +99,19 @@ class HeadAndShouldersPattern(BasePattern):
             "bearish",
             confidence,
             {
-                "left_shoulder": round(float(ls), 4),
-                "head": round(float(head), 4),
-                "right_shoulder": round(float(rs), 4),
+                "left_shoulder": float(ls),
+                "head": float(head),
+                "right_shoulder": float(rs),
                 "ls_bar": int(ls_i),
                 "head_bar": int(head_i),
                 "rs_bar": int(rs_i),
                 "ls_ts": ls_ts,       # timestamp levého ramene
                 "head_ts": head_ts,   # timestamp hlavy
                 "rs_ts": rs_ts,       # timestamp pravého ramene
-                "neckline": round(float(neckline), 4),
-                "current_close": round(float(current_close), 4),
-                "support": round(float(neckline), 4),
-                "resistance": round(float(head), 4),
+                "neckline": float(neckline),
+                "current_close": float(current_close),
+                "support": float(neckline),
+                "resistance": float(head),
             },
         )
 
@@ -125,9 +130,9 @@ class HeadAndShouldersPattern(BasePattern):
         if abs(ls - rs) / avg_shoulder > self.SHOULDER_TOLERANCE:
             return self._not_found()
 
-        p1_candidates = [p for p in peak_idx if ls_i < p < head_i]
-        p2_candidates = [p for p in peak_idx if head_i < p < rs_i]
-        if not p1_candidates or not p2_candidates:
+        p1_candidates = between(peak_idx, ls_i, head_i)
+        p2_candidates = between(peak_idx, head_i, rs_i)
+        if len(p1_candidates) == 0 or len(p2_candidates) == 0:
             return self._not_found()
 
         n1 = highs[p1_candidates[-1]]
@@ -155,18 +160,18 @@ class HeadAndShouldersPattern(BasePattern):
             "bullish",
             confidence,
             {
-                "left_shoulder": round(float(ls), 4),
-                "head": round(float(head), 4),
-                "right_shoulder": round(float(rs), 4),
+                "left_shoulder": float(ls),
+                "head": float(head),
+                "right_shoulder": float(rs),
                 "ls_bar": int(ls_i),
                 "head_bar": int(head_i),
                 "rs_bar": int(rs_i),
                 "ls_ts": ls_ts,       # timestamp levého ramene
                 "head_ts": head_ts,   # timestamp hlavy
                 "rs_ts": rs_ts,       # timestamp pravého ramene
-                "neckline": round(float(neckline), 4),
-                "current_close": round(float(current_close), 4),
-                "support": round(float(head), 4),
-                "resistance": round(float(neckline), 4),
+                "neckline": float(neckline),
+                "current_close": float(current_close),
+                "support": float(head),
+                "resistance": float(neckline),
             },
         )
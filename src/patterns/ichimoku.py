@@ -21,10 +21,129 @@ Confidence:
     - Cloud barva souhlasí: +10
 """
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
-from .base import BasePattern, PatternResult
+from ._numba import NUMBA_AVAILABLE, aot, eager, njit
+from .base import BasePattern, ExtremaCache, PatternResult
+
+# Příliš úzký cloud = neurčitý trh (flat konsolidace) → přeskočit
+# Minimální šířka cloudu: 0.2 % aktuální ceny
+MIN_CLOUD_WIDTH_PCT = 0.002
+
+
+@njit(cache=True)
+def _midpoint_at(highs, lows, end, period):
+    """(nejvyšší high + nejnižší low) / 2 za `period` svíček končících indexem `end`; NaN v okně → NaN."""
+    hi = -np.inf
+    lo = np.inf
+    for j in range(end - period + 1, end + 1):
+        h = highs[j]
+        l = lows[j]
+        if np.isnan(h) or np.isnan(l):
+            return np.nan
+        if h > hi:
+            hi = h
+        if l < lo:
+            lo = l
+    return (hi + lo) / 2
+
+
+@njit(*eager("_ichimoku_last"), cache=True)
+def _ichimoku_last(highs, lows, tenkan_period, kijun_period, senkou_b_period, shift):
+    """
+    Jen hodnoty, které detekce čte: Tenkan/Kijun na posledních dvou svíčkách
+    a Senkou A/B platné pro aktuální svíčku (spočítané před `shift` svíčkami).
+    Každé okno se projde jednou – žádné rolling řady přes celou historii.
+    """
+    n = len(highs)
+    t_curr = _midpoint_at(highs, lows, n - 1, tenkan_period)
+    t_prev = _midpoint_at(highs, lows, n - 2, tenkan_period)
+    k_curr = _midpoint_at(highs, lows, n - 1, kijun_period)
+    k_prev = _midpoint_at(highs, lows, n - 2, kijun_period)
+    src = n - 1 - shift
+    sa_curr = (_midpoint_at(highs, lows, src, tenkan_period)
+               + _midpoint_at(highs, lows, src, kijun_period)) / 2
+    sb_curr = _midpoint_at(highs, lows, src, senkou_b_period)
+    return t_curr, t_prev, k_curr, k_prev, sa_curr, sb_curr
+
+
+def _ichimoku_last_numpy(highs, lows, tenkan_period, kijun_period, senkou_b_period, shift):
+    """
+    NumPy varianta _ichimoku_last pro prostředí bez numba: každé okno je jeden
+    slice a max()/min() v C (NaN v okně se propaguje stejně jako v kernelu).
+    """
+    n = len(highs)
+
+    def mid(end, period):
+        start = end - period + 1
+        return (highs[start:end + 1].max() + lows[start:end + 1].min()) / 2
+
+    src = n - 1 - shift
+    return (
+        mid(n - 1, tenkan_period), mid(n - 2, tenkan_period),
+        mid(n - 1, kijun_period), mid(n - 2, kijun_period),
+        (mid(src, tenkan_period) + mid(src, kijun_period)) / 2,
+        mid(src, senkou_b_period),
+    )
+
+
+@njit(*eager("_ichimoku_signal"), cache=True)
+def _ichimoku_signal(t_prev, t_curr, k_prev, k_curr, sa, sb, close, chikou_ref):
+    """
+    Rozhodovací logika nad hotovými složkami (čistě skalární, bez Python objektů).
+    Vrací (směr, confidence, cena vs. cloud, Chikou potvrzení, barva cloudu);
+    směr +1 bullish / -1 bearish / 0 nic. chikou_ref = NaN → bez Chikou potvrzení.
+    """
+    # Kontrola NaN (NaN != NaN)
+    if (t_curr != t_curr or t_prev != t_prev or k_curr != k_curr or k_prev != k_prev
+            or sa != sa or sb != sb):
+        return 0, 0.0, False, False, False
+
+    # Cloud top a bottom (aktuální)
+    cloud_top = max(sa, sb)
+    cloud_bottom = min(sa, sb)
+    if cloud_top - cloud_bottom < close * MIN_CLOUD_WIDTH_PCT:
+        return 0, 0.0, False, False, False
+
+    confidence = 60.0
+
+    # --- Bullish TK Cross ---
+    if t_prev <= k_prev and t_curr > k_curr:
+        above_cloud = close > cloud_top                 # Cena nad cloudem
+        chikou_bullish = close > chikou_ref             # Chikou nad cenou před 26 svíčkami
+        cloud_bullish = sa > sb                         # Cloud je zelený
+        if above_cloud:
+            confidence += 15
+        if chikou_bullish:
+            confidence += 15
+        if cloud_bullish:
+            confidence += 10
+        return 1, min(100.0, confidence), above_cloud, chikou_bullish, cloud_bullish
+
+    # --- Bearish TK Cross ---
+    if t_prev >= k_prev and t_curr < k_curr:
+        below_cloud = close < cloud_bottom              # Cena pod cloudem
+        chikou_bearish = close < chikou_ref             # Chikou pod cenou před 26 svíčkami
+        cloud_bearish = sb > sa                         # Cloud je červený
+        if below_cloud:
+            confidence += 15
+        if chikou_bearish:
+            confidence += 15
+        if cloud_bearish:
+            confidence += 10
+        return -1, min(100.0, confidence), below_cloud, chikou_bearish, cloud_bearish
+
+    return 0, 0.0, False, False, False
+
+
+# AOT build když existuje (viz _kernels_build), jinak JIT kernel, bez numba NumPy slicy
+_ichimoku_last_fn = aot("_ichimoku_last") or (
+    _ichimoku_last if NUMBA_AVAILABLE else _ichimoku_last_numpy
+)
+_ichimoku_signal_fn = aot("_ichimoku_signal") or _ichimoku_signal
 
 
 class IchimokuPattern(BasePattern):
@@ -43,155 +162,66 @@ class IchimokuPattern(BasePattern):
     def supported_timeframes(self) -> list[str]:
         return ["4h", "1d"]
 
-    def detect(self, df: pd.DataFrame) -> PatternResult:
+    def detect(self, df: pd.DataFrame, extrema: Optional[ExtremaCache] = None) -> PatternResult:
         min_bars = self.SENKOU_B_PERIOD + self.CLOUD_SHIFT + 5
         if len(df) < min_bars:
             return self._not_found()
 
-        closes = df["close"]
-        highs = df["high"]
-        lows = df["low"]
+        view = ExtremaCache.of(df, extrema)
+        closes = view.closes
 
         # --- Výpočet složek ---
-        tenkan = self._midpoint(highs, lows, self.TENKAN_PERIOD)
-        kijun = self._midpoint(highs, lows, self.KIJUN_PERIOD)
-
-        # Senkou Span A = průměr Tenkan + Kijun, posunutý o 26 dopředu
-        # V historii: čteme hodnotu, která platila pro aktuální svíčku → index -26
-        span_a = ((tenkan + kijun) / 2).shift(self.CLOUD_SHIFT)
-
-        # Senkou Span B = midpoint za 52 period, posunutý o 26
-        span_b = self._midpoint(highs, lows, self.SENKOU_B_PERIOD).shift(self.CLOUD_SHIFT)
-
-        # Chikou Span = aktuální close posunutý 26 zpět
-        chikou = closes.shift(-self.CHIKOU_SHIFT)
+        # Tenkan/Kijun: aktuální (-1) a předchozí (-2) svíčka pro cross detekci.
+        # Senkou Span A = průměr Tenkan + Kijun, Senkou Span B = midpoint za 52 period,
+        # obě posunuté o 26 dopředu → pro aktuální svíčku čteme hodnoty z indexu -27
+        t_curr, t_prev, k_curr, k_prev, sa_curr, sb_curr = _ichimoku_last_fn(
+            view.highs, view.lows,
+            self.TENKAN_PERIOD, self.KIJUN_PERIOD, self.SENKOU_B_PERIOD, self.CLOUD_SHIFT,
+        )
 
-        # Pracujeme s posledními hodnotami
-        # Index -1 = aktuální svíčka, -2 = předchozí (pro cross detekci)
-        idx_curr = -1
-        idx_prev = -2
-
-        t_curr = tenkan.iloc[idx_curr]
-        t_prev = tenkan.iloc[idx_prev]
-        k_curr = kijun.iloc[idx_curr]
-        k_prev = kijun.iloc[idx_prev]
-
-        sa_curr = span_a.iloc[idx_curr]
-        sb_curr = span_b.iloc[idx_curr]
-
-        close_curr = closes.iloc[idx_curr]
+        close_curr = float(closes[-1])
 
         # Chikou: aktuální close vs. close před 26 svíčkami
         # Použijeme přímo historickou hodnotu – chikou_ref je close[−27]
-        if len(closes) > self.CHIKOU_SHIFT + 1:
-            chikou_ref_close = closes.iloc[-self.CHIKOU_SHIFT - 1]
-            if pd.isna(chikou_ref_close):
-                chikou_ref_close = None
-        else:
-            chikou_ref_close = None
+        # (min_bars zaručuje, že existuje; NaN = bez Chikou potvrzení)
+        chikou_ref_close = float(closes[-self.CHIKOU_SHIFT - 1])
 
-        # Kontrola NaN
-        if any(pd.isna(v) for v in [t_curr, t_prev, k_curr, k_prev, sa_curr, sb_curr]):
+        direction, confidence, price_ok, chikou_ok, cloud_ok = _ichimoku_signal_fn(
+            t_prev, t_curr, k_prev, k_curr, sa_curr, sb_curr, close_curr, chikou_ref_close,
+        )
+        if direction == 0:
             return self._not_found()
 
         # Cloud top a bottom (aktuální)
         cloud_top = max(sa_curr, sb_curr)
         cloud_bottom = min(sa_curr, sb_curr)
-
-        # Příliš úzký cloud = neurčitý trh (flat konsolidace) → přeskočit
-        # Minimální šířka cloudu: 0.2 % aktuální ceny
-        MIN_CLOUD_WIDTH_PCT = 0.002
-        cloud_width = cloud_top - cloud_bottom
-        if cloud_width < close_curr * MIN_CLOUD_WIDTH_PCT:
-            return self._not_found()
-
-        # --- Bullish TK Cross ---
-        bullish_cross = (t_prev <= k_prev) and (t_curr > k_curr)
-        # --- Bearish TK Cross ---
-        bearish_cross = (t_prev >= k_prev) and (t_curr < k_curr)
-
-        if not bullish_cross and not bearish_cross:
-            return self._not_found()
-
-        if bullish_cross:
-            confidence = 60.0
-
-            # Cena nad cloudem
-            above_cloud = close_curr > cloud_top
-            if above_cloud:
-                confidence += 15
-
-            # Chikou potvrzení (Chikou nad cenou před 26 svíčkami)
-            chikou_bullish = (chikou_ref_close is not None) and (close_curr > float(chikou_ref_close))
-            if chikou_bullish:
-                confidence += 15
-
-            # Cloud je zelený (bullish cloud)
-            cloud_bullish = sa_curr > sb_curr
-            if cloud_bullish:
-                confidence += 10
-
-            confidence = min(100.0, confidence)
-
-            return self._result(
-                "bullish",
-                confidence,
-                {
-                    "tenkan": round(float(t_curr), 4),
-                    "kijun": round(float(k_curr), 4),
-                    "senkou_a": round(float(sa_curr), 4),
-                    "senkou_b": round(float(sb_curr), 4),
-                    "cloud_top": round(float(cloud_top), 4),
-                    "cloud_bottom": round(float(cloud_bottom), 4),
-                    "above_cloud": above_cloud,
-                    "cloud_bullish": cloud_bullish,
-                    "chikou_bullish": chikou_bullish,
-                    "support": round(float(cloud_bottom), 4),
-                    "resistance": round(float(cloud_top), 4),
-                    "current_close": round(float(close_curr), 4),
-                },
-            )
-
-        else:  # bearish_cross
-            confidence = 60.0
-
-            # Cena pod cloudem
-            below_cloud = close_curr < cloud_bottom
-            if below_cloud:
-                confidence += 15
-
-            # Chikou potvrzení (Chikou pod cenou před 26 svíčkami)
-            chikou_bearish = (chikou_ref_close is not None) and (close_curr < float(chikou_ref_close))
-            if chikou_bearish:
-                confidence += 15
-
-            # Cloud je červený (bearish cloud)
-            cloud_bearish = sb_curr > sa_curr
-            if cloud_bearish:
-                confidence += 10
-
-            confidence = min(100.0, confidence)
-
-            return self._result(
-                "bearish",
-                confidence,
-                {
-                    "tenkan": round(float(t_curr), 4),
-                    "kijun": round(float(k_curr), 4),
-                    "senkou_a": round(float(sa_curr), 4),
-                    "senkou_b": round(float(sb_curr), 4),
-                    "cloud_top": round(float(cloud_top), 4),
-                    "cloud_bottom": round(float(cloud_bottom), 4),
-                    "below_cloud": below_cloud,
-                    "cloud_bearish": cloud_bearish,
-                    "chikou_bearish": chikou_bearish,
-                    "support": round(float(cloud_bottom), 4),
-                    "resistance": round(float(cloud_top), 4),
-                    "current_close": round(float(close_curr), 4),
-                },
-            )
-
-    @staticmethod
-    def _midpoint(highs: pd.Series, lows: pd.Series, period: int) -> pd.Series:
-        """Highest high + Lowest low za N period, děleno 2."""
-        return (highs.rolling(period).max() + lows.rolling(period).min()) / 2
+        details = {
+            "tenkan": float(t_curr),
+            "kijun": float(k_curr),
+            "senkou_a": float(sa_curr),
+            "senkou_b": float(sb_curr),
+            "cloud_top": float(cloud_top),
+            "cloud_bottom": float(cloud_bottom),
+        }
+
+        if direction > 0:
+            details.update({
+                "above_cloud": price_ok,
+                "cloud_bullish": cloud_ok,
+                "chikou_bullish": chikou_ok,
+            })
+            signal_type = "bullish"
+        else:
+            details.update({
+                "below_cloud": price_ok,
+                "cloud_bearish": cloud_ok,
+                "chikou_bearish": chikou_ok,
+            })
+            signal_type = "bearish"
+
+        details.update({
+            "support": float(cloud_bottom),
+            "resistance": float(cloud_top),
+            "current_close": close_curr,
+        })
+        return self._result(signal_type, confidence, details)
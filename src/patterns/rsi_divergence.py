@@ -11,41 +11,99 @@ Podpora a odpor:
 - Bearish: odpor = skutečné nedávné price maximum, podpora = nejbližší swing low POD cenou
 """
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
-from scipy.signal import argrelextrema
 
-from .base import BasePattern, PatternResult
+from ._extrema import nearest_peak_above, nearest_trough_below
+from ._numba import aot, eager, njit
+from .base import BasePattern, ExtremaCache, PatternResult
 
 
-def _nearest_swing_high(df: pd.DataFrame, current_close: float, lookback: int = 50) -> float:
+def _nearest_swing_high(highs: np.ndarray, current_close: float, lookback: int = 50) -> float:
     """Nejbližší swing high NAD aktuální cenou z posledních `lookback` svíček."""
-    window = df.tail(lookback)
-    highs = window["high"].values
-    peak_idx = argrelextrema(highs, np.greater_equal, order=3)[0]
-    above = [highs[i] for i in peak_idx if highs[i] > current_close]
-    if above:
-        return float(min(above))
-    return float(highs.max())
+    return float(_nearest_peak_above(highs[-lookback:], current_close, 3))
 
 
-def _nearest_swing_low(df: pd.DataFrame, current_close: float, lookback: int = 50) -> float:
+def _nearest_swing_low(lows: np.ndarray, current_close: float, lookback: int = 50) -> float:
     """Nejbližší swing low POD aktuální cenou z posledních `lookback` svíček."""
-    window = df.tail(lookback)
-    lows = window["low"].values
-    trough_idx = argrelextrema(lows, np.less_equal, order=3)[0]
-    below = [lows[i] for i in trough_idx if lows[i] < current_close]
-    if below:
-        return float(max(below))
-    return float(lows.min())
-
-
-def _rsi(closes: pd.Series, period: int = 14) -> pd.Series:
-    delta = closes.diff()
-    gain = delta.clip(lower=0).rolling(period).mean()
-    loss = (-delta.clip(upper=0)).rolling(period).mean()
-    rs = gain / loss.replace(0, np.nan)
-    return 100 - (100 / (1 + rs))
+    return float(_nearest_trough_below(lows[-lookback:], current_close, 3))
+
+
+@njit(*eager("_rsi_tail"), cache=True)
+def _rsi_tail(closes, period, count):
+    """
+    RSI (průměrný zisk/ztráta za `period` změn, stejně jako v dashboardu) pro
+    posledních `count` svíček – jen okna, která detekce čte, bez mezilehlých Series.
+    Okno bez ztrát = 100, okno beze změny = NaN.
+    """
+    n = len(closes)
+    out = np.empty(count)
+    for k in range(count):
+        end = n - count + k
+        gain = 0.0
+        loss = 0.0
+        for j in range(end - period + 1, end + 1):
+            d = closes[j] - closes[j - 1]
+            if d > 0:
+                gain += d
+            else:
+                loss -= d
+        gain /= period
+        loss /= period
+        if loss == 0:
+            out[k] = 100.0 if gain > 0 else np.nan
+        else:
+            out[k] = 100 - 100 / (1 + gain / loss)
+    return out
+
+
+@njit(*eager("_window_extrema"), cache=True)
+def _window_extrema(close, rsi, mid):
+    """
+    Minima a maxima ceny i RSI v obou polovinách okna (před / od `mid`) v jednom
+    průchodu: (price_low_recent, price_low_past, price_high_recent, price_high_past,
+    rsi_low_recent, rsi_low_past, rsi_high_recent, rsi_high_past).
+    NaN se propaguje stejně jako u np.min/np.max.
+    """
+    pl_r = close[mid]
+    ph_r = close[mid]
+    rl_r = rsi[mid]
+    rh_r = rsi[mid]
+    pl_p = close[0]
+    ph_p = close[0]
+    rl_p = rsi[0]
+    rh_p = rsi[0]
+    for i in range(len(close)):
+        p = close[i]
+        r = rsi[i]
+        if i < mid:
+            if p < pl_p or p != p:
+                pl_p = p
+            if p > ph_p or p != p:
+                ph_p = p
+            if r < rl_p or r != r:
+                rl_p = r
+            if r > rh_p or r != r:
+                rh_p = r
+        else:
+            if p < pl_r or p != p:
+                pl_r = p
+            if p > ph_r or p != p:
+                ph_r = p
+            if r < rl_r or r != r:
+                rl_r = r
+            if r > rh_r or r != r:
+                rh_r = r
+    return pl_r, pl_p, ph_r, ph_p, rl_r, rl_p, rh_r, rh_p
+
+
+# AOT build when present (see _kernels_build), else the JIT kernels
+_rsi_tail_fn = aot("_rsi_tail") or _rsi_tail
+_window_extrema_fn = aot("_window_extrema") or _window_extrema
+_nearest_peak_above = aot("nearest_peak_above") or nearest_peak_above
+_nearest_trough_below = aot("nearest_trough_below") or nearest_trough_below
 
 
 class RSIDivergencePattern(BasePattern):
@@ -60,29 +118,27 @@ class RSIDivergencePattern(BasePattern):
     def supported_timeframes(self) -> list[str]:
         return ["1h", "4h", "1d"]
 
-    def detect(self, df: pd.DataFrame) -> PatternResult:
+    def detect(self, df: pd.DataFrame, extrema: Optional[ExtremaCache] = None) -> PatternResult:
         needed = self.LOOKBACK + self.RSI_PERIOD + 5
         if len(df) < needed:
             return self._not_found()
 
-        closes = df["close"]
-        rsi = _rsi(closes, self.RSI_PERIOD).dropna()
-
-        if len(rsi) < self.LOOKBACK:
-            return self._not_found()
+        view = ExtremaCache.of(df, extrema)
+        closes = view.closes
 
-        # Align recent window
-        recent_close = closes.iloc[-self.LOOKBACK:].values
-        recent_rsi = rsi.iloc[-self.LOOKBACK:].values
+        # Align recent window (RSI only for the bars the comparison reads)
+        recent_close = closes[-self.LOOKBACK:]
+        recent_rsi = _rsi_tail_fn(closes, self.RSI_PERIOD, self.LOOKBACK)
 
-        # Compare latest vs mid-window extremes
+        # Compare latest vs mid-window extremes (all eight in one pass)
         mid = self.LOOKBACK // 2
+        (
+            price_low_recent, price_low_past, price_high_recent, price_high_past,
+            rsi_low_recent, rsi_low_past, rsi_high_recent, rsi_high_past,
+        ) = _window_extrema_fn(recent_close, recent_rsi, mid)
+        current_rsi = float(recent_rsi[-1])
 
         # --- Bullish divergence: price lower low, RSI higher low ---
-        price_low_recent = np.min(recent_close[mid:])
-        price_low_past = np.min(recent_close[:mid])
-        rsi_low_recent = np.min(recent_rsi[mid:])
-        rsi_low_past = np.min(recent_rsi[:mid])
 
         if price_low_recent < price_low_past and rsi_low_recent > rsi_low_past:
             price_divergence = (price_low_past - price_low_recent) / price_low_past
@@ -90,31 +146,27 @@ class RSIDivergencePattern(BasePattern):
             confidence = min(100, 55 + price_divergence * 500 + rsi_divergence * 100)
 
             if confidence >= 55:
-                current_close = float(closes.iloc[-1])
+                current_close = float(closes[-1])
                 # Podpora = skutečné nedávné price dno (divergenční bod)
-                support_level = round(float(price_low_recent), 4)
+                support_level = float(price_low_recent)
                 # Odpor = nejbližší swing high NAD aktuální cenou (reálná TA úroveň)
-                resistance_level = round(_nearest_swing_high(df, current_close), 4)
+                resistance_level = _nearest_swing_high(view.highs, current_close)
                 return self._result(
                     "bullish",
                     confidence,
                     {
-                        "price_low_recent": round(float(price_low_recent), 4),
-                        "price_low_past": round(float(price_low_past), 4),
-                        "rsi_low_recent": round(float(rsi_low_recent), 2),
-                        "rsi_low_past": round(float(rsi_low_past), 2),
-                        "current_rsi": round(float(recent_rsi[-1]), 2),
+                        "price_low_recent": float(price_low_recent),
+                        "price_low_past": float(price_low_past),
+                        "rsi_low_recent": float(rsi_low_recent),
+                        "rsi_low_past": float(rsi_low_past),
+                        "current_rsi": current_rsi,
                         "support": support_level,
                         "resistance": resistance_level,
-                        "current_close": round(current_close, 4),
+                        "current_close": current_close,
                     },
                 )
 
         # --- Bearish divergence: price higher high, RSI lower high ---
-        price_high_recent = np.max(recent_close[mid:])
-        price_high_past = np.max(recent_close[:mid])
-        rsi_high_recent = np.max(recent_rsi[mid:])
-        rsi_high_past = np.max(recent_rsi[:mid])
 
         if price_high_recent > price_high_past and rsi_high_recent < rsi_high_past:
             price_divergence = (price_high_recent - price_high_past) / price_high_past
@@ -122,23 +174,23 @@ class RSIDivergencePattern(BasePattern):
             confidence = min(100, 55 + price_divergence * 500 + rsi_divergence * 100)
 
             if confidence >= 55:
-                current_close = float(closes.iloc[-1])
+                current_close = float(closes[-1])
                 # Odpor = skutečné nedávné price maximum (divergenční bod)
-                resistance_level = round(float(price_high_recent), 4)
+                resistance_level = float(price_high_recent)
                 # Podpora = nejbližší swing low POD aktuální cenou (reálná TA úroveň)
-                support_level = round(_nearest_swing_low(df, current_close), 4)
+                support_level = _nearest_swing_low(view.lows, current_close)
                 return self._result(
                     "bearish",
                     confidence,
                     {
-                        "price_high_recent": round(float(price_high_recent), 4),
-                        "price_high_past": round(float(price_high_past), 4),
-                        "rsi_high_recent": round(float(rsi_high_recent), 2),
-                        "rsi_high_past": round(float(rsi_high_past), 2),
-                        "current_rsi": round(float(recent_rsi[-1]), 2),
+                        "price_high_recent": float(price_high_recent),
+                        "price_high_past": float(price_high_past),
+                        "rsi_high_recent": float(rsi_high_recent),
+                        "rsi_high_past": float(rsi_high_past),
+                        "current_rsi": current_rsi,
                         "support": support_level,
                         "resistance": resistance_level,
-                        "current_close": round(current_close, 4),
+                        "current_close": current_close,
                     },
                 )
 
@@ -13,33 +13,31 @@ Podpora a odpor po průlomu:
   nová PODPORA = nejbližší historický swing low POD cenou
 """
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
-from scipy.signal import argrelextrema
 
-from .base import BasePattern, PatternResult
+from ._extrema import nearest_peak_above, nearest_trough_below, peaks, troughs
+from ._numba import aot
+from .base import BasePattern, ExtremaCache, PatternResult
+
+
+# AOT build if present, else the JIT kernel (see _kernels_build)
+_nearest_peak_above = aot("nearest_peak_above") or nearest_peak_above
+_nearest_trough_below = aot("nearest_trough_below") or nearest_trough_below
 
 
-def _nearest_swing_high_above(df: pd.DataFrame, current_close: float, lookback: int = 100) -> float:
+def _nearest_swing_high_above(highs: np.ndarray, current_close: float, lookback: int = 100) -> float:
     """Nejbližší swing high NAD aktuální cenou (další odpor po průlomu)."""
-    window = df.tail(lookback)
-    highs = window["high"].values
-    peak_idx = argrelextrema(highs, np.greater_equal, order=3)[0]
-    above = [highs[i] for i in peak_idx if highs[i] > current_close * 1.001]  # alespoň 0.1 % nad cenou
-    if above:
-        return float(min(above))
-    return float(highs.max())
+    # alespoň 0.1 % nad cenou
+    return float(_nearest_peak_above(highs[-lookback:], current_close * 1.001, 3))
 
 
-def _nearest_swing_low_below(df: pd.DataFrame, current_close: float, lookback: int = 100) -> float:
+def _nearest_swing_low_below(lows: np.ndarray, current_close: float, lookback: int = 100) -> float:
     """Nejbližší swing low POD aktuální cenou (další podpora po průlomu)."""
-    window = df.tail(lookback)
-    lows = window["low"].values
-    trough_idx = argrelextrema(lows, np.less_equal, order=3)[0]
-    below = [lows[i] for i in trough_idx if lows[i] < current_close * 0.999]  # alespoň 0.1 % pod cenou
-    if below:
-        return float(max(below))
-    return float(lows.min())
+    # alespoň 0.1 % pod cenou
+    return float(_nearest_trough_below(lows[-lookback:], current_close * 0.999, 3))
 
 
 class SupportResistancePattern(BasePattern):
@@ -56,132 +54,131 @@ class SupportResistancePattern(BasePattern):
     def supported_timeframes(self) -> list[str]:
         return ["1h", "4h", "1d"]
 
-    def detect(self, df: pd.DataFrame) -> PatternResult:
+    def detect(self, df: pd.DataFrame, extrema: Optional[ExtremaCache] = None) -> PatternResult:
         if len(df) < self.LOOKBACK + 5:
             return self._not_found()
 
-        data = df.tail(self.LOOKBACK + 5)
+        view = ExtremaCache.of(df, extrema)
+        start = len(df) - (self.LOOKBACK + 5)
         # Use LOOKBACK bars (excluding latest 2 for confirmation)
-        history = data.iloc[:-2]
-        current = data.iloc[-1]
-        prev = data.iloc[-2]
-
-        highs = history["high"].values
-        lows = history["low"].values
-        closes = history["close"].values
-        volumes = data["volume"].values
+        highs = view.highs[start:-2]
+        lows = view.lows[start:-2]
+        closes = view.closes[start:-2]
+        volumes = view.volumes[start:]
 
         # Candidate levels: local peaks and troughs
         order = 3
-        peak_idx = argrelextrema(highs, np.greater_equal, order=order)[0]
-        trough_idx = argrelextrema(lows, np.less_equal, order=order)[0]
+        peak_idx = peaks(highs, order)
+        trough_idx = troughs(lows, order)
 
-        candidate_levels = []
-        for idx in peak_idx:
-            candidate_levels.append(("resistance", highs[idx]))
-        for idx in trough_idx:
-            candidate_levels.append(("support", lows[idx]))
+        # Peaks first, then troughs – the order the clustering seeds in
+        candidate_prices = np.concatenate((highs[peak_idx], lows[trough_idx]))
+        candidate_resist = np.arange(len(candidate_prices)) < len(peak_idx)
 
-        if not candidate_levels:
+        if len(candidate_prices) == 0:
             return self._not_found()
 
         # Cluster nearby levels
-        levels = self._cluster_levels(candidate_levels, closes)
+        levels = self._cluster_levels(candidate_prices, candidate_resist, closes)
 
         # Current close and volume
-        current_close = float(current["close"])
-        prev_close = float(prev["close"])
+        current_close = float(view.closes[-1])
+        prev_close = float(view.closes[-2])
         avg_volume = np.mean(volumes[-21:-1]) if len(volumes) > 21 else np.mean(volumes[:-1])
-        current_volume = float(current["volume"])
+        current_volume = float(volumes[-1])
         volume_ratio = current_volume / avg_volume if avg_volume > 0 else 0
         volume_confirmed = volume_ratio >= self.VOLUME_MULTIPLIER
 
-        for level_type, price, touches in levels:
-            if touches < self.MIN_TOUCHES:
-                continue
+        if not levels:
+            return self._not_found()
+
+        # Breakout: previous close was on one side, current is on the other.
+        # All levels are tested at once; the first hit in touch order wins.
+        level_types, level_prices, level_touches = zip(*levels)
+        prices = np.array(level_prices)
+        is_resist = np.array(level_types) == "resistance"
+        strong = np.array(level_touches) >= self.MIN_TOUCHES
+        broke_up = strong & is_resist & (prev_close < prices) & (current_close > prices)
+        broke_down = strong & ~is_resist & (prev_close > prices) & (current_close < prices)
+        hits = np.flatnonzero(broke_up | broke_down)
+        if len(hits) == 0:
+            return self._not_found()
 
-            # Breakout: previous close was on one side, current is on the other
-            if level_type == "resistance":
-                broke_up = prev_close < price and current_close > price
-                if broke_up:
-                    touch_score = min(touches / 5, 1.0)
-                    vol_score = min((volume_ratio - 1) / 2, 1.0) if volume_confirmed else 0
-                    confidence = min(100, 60 + touch_score * 20 + vol_score * 20)
-                    # Prolomená rezistence = nová PODPORA (S/R flip)
-                    # Nový ODPOR = nejbližší historický swing high NAD cenou
-                    next_resistance = round(_nearest_swing_high_above(df, current_close), 4)
-                    return self._result(
-                        "bullish",
-                        confidence,
-                        {
-                            "level_type": "resistance",
-                            "level_price": round(price, 4),
-                            "touches": touches,
-                            "volume_ratio": round(volume_ratio, 2),
-                            "volume_confirmed": volume_confirmed,
-                            "support": round(price, 4),       # prolomená úroveň = nová podpora
-                            "resistance": next_resistance,     # nejbližší swing high nad cenou
-                            "current_close": round(current_close, 4),
-                        },
-                    )
-            elif level_type == "support":
-                broke_down = prev_close > price and current_close < price
-                if broke_down:
-                    touch_score = min(touches / 5, 1.0)
-                    vol_score = min((volume_ratio - 1) / 2, 1.0) if volume_confirmed else 0
-                    confidence = min(100, 60 + touch_score * 20 + vol_score * 20)
-                    # Prolomená podpora = nový ODPOR (S/R flip)
-                    # Nová PODPORA = nejbližší historický swing low POD cenou
-                    next_support = round(_nearest_swing_low_below(df, current_close), 4)
-                    return self._result(
-                        "bearish",
-                        confidence,
-                        {
-                            "level_type": "support",
-                            "level_price": round(price, 4),
-                            "touches": touches,
-                            "volume_ratio": round(volume_ratio, 2),
-                            "volume_confirmed": volume_confirmed,
-                            "support": next_support,           # nejbližší swing low pod cenou
-                            "resistance": round(price, 4),     # prolomená úroveň = nový odpor
-                            "current_close": round(current_close, 4),
-                        },
-                    )
-
-        return self._not_found()
-
-    def _cluster_levels(self, candidates: list, closes: np.ndarray) -> list:
-        """Cluster candidate levels into significant price levels with touch counts."""
-        if not candidates:
+        level_type, price, touches = levels[hits[0]]
+        touch_score = min(touches / 5, 1.0)
+        vol_score = min((volume_ratio - 1) / 2, 1.0) if volume_confirmed else 0
+        confidence = min(100, 60 + touch_score * 20 + vol_score * 20)
+
+        if level_type == "resistance":
+            # Prolomená rezistence = nová PODPORA (S/R flip)
+            # Nový ODPOR = nejbližší historický swing high NAD cenou
+            next_resistance = _nearest_swing_high_above(view.highs, current_close)
+            return self._result(
+                "bullish",
+                confidence,
+                {
+                    "level_type": "resistance",
+                    "level_price": price,
+                    "touches": touches,
+                    "volume_ratio": volume_ratio,
+                    "volume_confirmed": volume_confirmed,
+                    "support": price,       # prolomená úroveň = nová podpora
+                    "resistance": next_resistance,     # nejbližší swing high nad cenou
+                    "current_close": current_close,
+                },
+            )
+
+        # Prolomená podpora = nový ODPOR (S/R flip)
+        # Nová PODPORA = nejbližší historický swing low POD cenou
+        next_support = _nearest_swing_low_below(view.lows, current_close)
+        return self._result(
+            "bearish",
+            confidence,
+            {
+                "level_type": "support",
+                "level_price": price,
+                "touches": touches,
+                "volume_ratio": volume_ratio,
+                "volume_confirmed": volume_confirmed,
+                "support": next_support,           # nejbližší swing low pod cenou
+                "resistance": price,     # prolomená úroveň = nový odpor
+                "current_close": current_close,
+            },
+        )
+
+    def _cluster_levels(self, prices: np.ndarray, is_resist: np.ndarray, closes: np.ndarray) -> list:
+        """
+        Cluster candidate levels into significant price levels with touch counts.
+
+        Greedy in candidate order: each not yet used candidate seeds a cluster of
+        all unused candidates within LEVEL_TOLERANCE of it. The pairwise distance
+        test runs once as one (N, N) array op, so Python only loops per cluster.
+        """
+        if len(prices) == 0:
             return []
 
         price_range = closes.max() - closes.min()
         if price_range == 0:
             return []
 
+        with np.errstate(divide="ignore", invalid="ignore"):
+            within = np.abs(prices[:, None] - prices[None, :]) / prices[:, None] < self.LEVEL_TOLERANCE
+
         clustered = []
-        used = [False] * len(candidates)
+        unused = np.ones(len(prices), dtype=bool)
 
-        for i, (ltype, price) in enumerate(candidates):
-            if used[i]:
+        for i in range(len(prices)):
+            if not unused[i]:
                 continue
-            cluster_prices = [price]
-            cluster_types = [ltype]
-            used[i] = True
-
-            for j, (ltype2, price2) in enumerate(candidates):
-                if used[j]:
-                    continue
-                if abs(price - price2) / price < self.LEVEL_TOLERANCE:
-                    cluster_prices.append(price2)
-                    cluster_types.append(ltype2)
-                    used[j] = True
-
-            avg_price = np.mean(cluster_prices)
-            touches = len(cluster_prices)
+            members = within[i] & unused
+            members[i] = True
+            unused &= ~members
+
+            avg_price = np.mean(prices[members])
+            touches = int(members.sum())
             # Determine dominant type
-            n_resist = cluster_types.count("resistance")
-            n_support = cluster_types.count("support")
+            n_resist = int(is_resist[members].sum())
+            n_support = touches - n_resist
             dominant = "resistance" if n_resist >= n_support else "support"
             clustered.append((dominant, avg_price, touches))
 
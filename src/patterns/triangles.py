@@ -10,11 +10,23 @@ Descending Triangle:
 - Price is compressing into the support
 """
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
-from scipy.signal import argrelextrema
 
-from .base import BasePattern, PatternResult
+from ._extrema import peaks, troughs
+from .base import BasePattern, ExtremaCache, PatternResult
+
+
+def _slope(y: np.ndarray) -> float:
+    """
+    Least-squares slope of y against 0..n-1 (n >= 2) – same as np.polyfit(range(n), y, 1)[0].
+    With x = 0..n-1 the x mean and variance are known, so it reduces to one weighted sum.
+    """
+    n = y.size
+    i = np.arange(n, dtype=np.float64)
+    return float(((2 * i - (n - 1)) * y).sum() * 6.0 / (n * (n * n - 1)))
 
 
 class TrianglesPattern(BasePattern):
@@ -30,18 +42,18 @@ class TrianglesPattern(BasePattern):
     def supported_timeframes(self) -> list[str]:
         return ["4h", "1d"]
 
-    def detect(self, df: pd.DataFrame) -> PatternResult:
+    def detect(self, df: pd.DataFrame, extrema: Optional[ExtremaCache] = None) -> PatternResult:
         if len(df) < self.LOOKBACK:
             return self._not_found()
 
-        data = df.tail(self.LOOKBACK).copy()
-        highs = data["high"].values
-        lows = data["low"].values
-        closes = data["close"].values
+        view = ExtremaCache.of(df, extrema)
+        highs = view.highs[-self.LOOKBACK:]
+        lows = view.lows[-self.LOOKBACK:]
+        closes = view.closes[-self.LOOKBACK:]
 
         order = 4
-        peak_idx = argrelextrema(highs, np.greater_equal, order=order)[0]
-        trough_idx = argrelextrema(lows, np.less_equal, order=order)[0]
+        peak_idx = peaks(highs, order)
+        trough_idx = troughs(lows, order)
 
         result = self._check_ascending(highs, lows, closes, peak_idx, trough_idx)
         if result.found:
@@ -66,7 +78,7 @@ class TrianglesPattern(BasePattern):
         if len(trough_prices) < 2:
             return self._not_found()
 
-        trough_slope = np.polyfit(range(len(trough_prices)), trough_prices, 1)[0]
+        trough_slope = _slope(trough_prices)
         if trough_slope <= 0:
             return self._not_found()
 
@@ -86,12 +98,12 @@ class TrianglesPattern(BasePattern):
             "bullish",
             confidence,
             {
-                "resistance": round(float(resistance_level), 4),
-                "support": round(support, 4),
-                "support_start": round(support_start, 4),  # začátek stoupající support linie
-                "rising_low_slope": round(float(trough_slope), 6),
+                "resistance": float(resistance_level),
+                "support": support,
+                "support_start": support_start,  # začátek stoupající support linie
+                "rising_low_slope": float(trough_slope),
                 "touches": int(min(len(peak_idx), self.MIN_TOUCHES)),
-                "current_close": round(float(current_close), 4),
+                "current_close": float(current_close),
             },
         )
 
@@ -112,7 +124,7 @@ class TrianglesPattern(BasePattern):
         if len(peak_prices) < 2:
             return self._not_found()
 
-        peak_slope = np.polyfit(range(len(peak_prices)), peak_prices, 1)[0]
+        peak_slope = _slope(peak_prices)
         if peak_slope >= 0:
             return self._not_found()
 
@@ -131,11 +143,11 @@ class TrianglesPattern(BasePattern):
             "bearish",
             confidence,
             {
-                "support": round(float(support_level), 4),
-                "resistance": round(resistance, 4),
-                "resistance_start": round(resistance_start, 4),  # začátek klesající resistance linie
-                "falling_high_slope": round(float(peak_slope), 6),
+                "support": float(support_level),
+                "resistance": resistance,
+                "resistance_start": resistance_start,  # začátek klesající resistance linie
+                "falling_high_slope": float(peak_slope),
                 "touches": int(min(len(trough_idx), self.MIN_TOUCHES)),
-                "current_close": round(float(current_close), 4),
+                "current_close": float(current_close),
             },
         )
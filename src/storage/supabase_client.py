@@ -21,11 +21,15 @@ Table schema (create this in Supabase SQL editor):
         ON alerts (asset, timeframe, pattern, detected_at DESC);
     CREATE INDEX idx_alerts_asset_time
         ON alerts (asset, detected_at DESC);
+    CREATE INDEX idx_alerts_time
+        ON alerts (detected_at DESC);   -- prime_duplicate_cache range scan
 """
 
 import json
 import logging
 import os
+import random
+import threading
 import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
@@ -59,26 +63,91 @@ def _get_client() -> Optional[Client]:
         return None
 
 
+# Shared client, created on first use. Reads skip the lock; creation holds it so
+# concurrent first calls (scan threads, Streamlit sessions) build only one client.
 _client: Optional[Client] = None
+_CLIENT_LOCK = threading.Lock()
 
 
 def get_client() -> Optional[Client]:
+    client = _client
+    if client is not None:
+        return client
+    return _create_shared_client()
+
+
+def _create_shared_client() -> Optional[Client]:
     global _client
-    if _client is None:
-        _client = _get_client()
-    return _client
+    with _CLIENT_LOCK:
+        if _client is None:
+            _client = _get_client()
+        return _client
+
+
+# Retry backoff: base * 2**attempt seconds (capped), scaled by a random 0.5–1.5
+# jitter so concurrent callers hitting the same outage do not retry in lockstep
+DB_RETRY_BASE = 1.0
+DB_RETRY_CAP = 8.0
 
 
 def _retry_db(func, *args, max_attempts: int = 3, **kwargs):
-    delays = [2, 4, 8]
     for attempt in range(max_attempts):
         try:
             return func(*args, **kwargs)
         except Exception as exc:
             if attempt == max_attempts - 1:
                 raise
-            logger.warning("DB attempt %d/%d failed: %s", attempt + 1, max_attempts, exc)
-            time.sleep(delays[attempt])
+            wait = min(DB_RETRY_CAP, DB_RETRY_BASE * 2 ** attempt) * (0.5 + random.random())
+            logger.warning(
+                "DB attempt %d/%d failed: %s – retrying in %.1fs",
+                attempt + 1, max_attempts, exc, wait,
+            )
+            time.sleep(wait)
+
+
+# Rows per request when priming the duplicate cache (PostgREST caps a response at max-rows)
+DUPLICATE_PAGE_SIZE = 1000
+
+
+def prime_duplicate_cache(cooldown_hours: int = 24) -> Optional[set[tuple[str, str, str, str]]]:
+    """
+    Fetch every alert within the cooldown period once, as a set of
+    (asset, timeframe, pattern, type) keys for is_duplicate(cache=...).
+    Returns None if Supabase is unavailable or the query fails, so callers
+    fall back to the per-alert query.
+    """
+    client = get_client()
+    if client is None:
+        return None
+
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=cooldown_hours)).isoformat()
+
+    try:
+        keys: set[tuple[str, str, str, str]] = set()
+        start = 0
+        while True:
+            def _query(start=start):
+                return (
+                    client.table("alerts")
+                    .select("asset, timeframe, pattern, type")
+                    .gte("detected_at", cutoff)
+                    .order("id")
+                    .range(start, start + DUPLICATE_PAGE_SIZE - 1)
+                    .execute()
+                )
+
+            rows = _retry_db(_query).data or []
+            keys.update((r["asset"], r["timeframe"], r["pattern"], r["type"]) for r in rows)
+            if len(rows) < DUPLICATE_PAGE_SIZE:
+                break
+            start += DUPLICATE_PAGE_SIZE
+
+        logger.info("Duplicate cache primed: %d alert keys within %dh", len(keys), cooldown_hours)
+        return keys
+
+    except Exception as exc:
+        logger.error("Priming duplicate cache failed: %s – using per-alert checks", exc)
+        return None
 
 
 def is_duplicate(
@@ -87,12 +156,17 @@ def is_duplicate(
     pattern: str,
     signal_type: str,
     cooldown_hours: int = 24,
+    cache: Optional[set[tuple[str, str, str, str]]] = None,
 ) -> bool:
     """
     Returns True if the same pattern + signal_type was alerted within the cooldown period.
     signal_type is included so that a bullish → bearish flip on the same pattern
     is treated as a new alert (not a duplicate).
+    With `cache` (from prime_duplicate_cache) this is a set lookup, no query.
     """
+    if cache is not None:
+        return (asset, timeframe, pattern, signal_type) in cache
+
     client = get_client()
     if client is None:
         logger.warning("Supabase unavailable – skipping duplicate check")
@@ -101,10 +175,13 @@ def is_duplicate(
     cutoff = (datetime.now(timezone.utc) - timedelta(hours=cooldown_hours)).isoformat()
 
     try:
+        # Existence check: at most one row with just its id (served from
+        # idx_alerts_lookup). Not a HEAD/count request – postgrest-py parses
+        # the empty HEAD body as count=0, which would hide every duplicate.
         def _query():
             return (
                 client.table("alerts")
-                .select("id, detected_at")
+                .select("id")
                 .eq("asset", asset)
                 .eq("timeframe", timeframe)
                 .eq("pattern", pattern)
@@ -122,7 +199,7 @@ def is_duplicate(
         return False
 
 
-def save_alert(
+def alert_record(
     asset: str,
     timeframe: str,
     pattern: str,
@@ -132,10 +209,9 @@ def save_alert(
     message_sent: bool = False,
     key_levels: Optional[dict] = None,
     pattern_data: Optional[dict] = None,
-) -> Optional[int]:
-    """Persist a new alert to Supabase. Returns the inserted record id or None."""
-    client = get_client()
-    record = {
+) -> dict:
+    """Row for the alerts table, as inserted by save_alert / save_alerts_bulk."""
+    return {
         "asset": asset,
         "timeframe": timeframe,
         "pattern": pattern,
@@ -148,10 +224,33 @@ def save_alert(
         "pattern_data": pattern_data or {},
     }
 
+
+def save_alert(
+    asset: str,
+    timeframe: str,
+    pattern: str,
+    signal_type: str,
+    confidence: float,
+    price: float,
+    message_sent: bool = False,
+    key_levels: Optional[dict] = None,
+    pattern_data: Optional[dict] = None,
+) -> Optional[int]:
+    """Persist a new alert to Supabase. Returns the inserted record id or None."""
+    client = get_client()
+    record = alert_record(
+        asset, timeframe, pattern, signal_type, confidence, price,
+        message_sent, key_levels, pattern_data,
+    )
+
     if client is None:
         logger.info("ALERT (no DB): %s", record)
         return None
+    return _insert_record(client, record)
+
 
+def _insert_record(client: Client, record: dict) -> Optional[int]:
+    """INSERT one alert row; the new id, or None on failure."""
     try:
         def _insert():
             return client.table("alerts").insert(record).execute()
@@ -167,22 +266,63 @@ def save_alert(
     return None
 
 
+def save_alerts_bulk(records: list[dict]) -> list[Optional[int]]:
+    """
+    Persist many alert_record() rows with a single INSERT (one round-trip).
+    Returns the inserted ids in order (None where a row could not be saved).
+    If the bulk INSERT fails, the rows are retried one by one, so one bad
+    row does not cost the others their persistence.
+    """
+    if not records:
+        return []
+
+    client = get_client()
+    if client is None:
+        for record in records:
+            logger.info("ALERT (no DB): %s", record)
+        return [None] * len(records)
+
+    try:
+        def _insert():
+            return client.table("alerts").insert(records).execute()
+
+        response = _retry_db(_insert)
+    except Exception as exc:
+        logger.error("Bulk save of %d alerts failed: %s – saving one by one", len(records), exc)
+        return [_insert_record(client, record) for record in records]
+
+    ids = [row.get("id") for row in (response.data or [])]
+    if len(ids) != len(records):
+        # Rows were written but the response does not map back to them;
+        # re-inserting would duplicate them
+        logger.error("Bulk save returned %d rows for %d alerts", len(ids), len(records))
+        return [None] * len(records)
+    logger.info("%d alerts saved to Supabase: ids=%s", len(ids), ids)
+    return ids
+
+
 def mark_message_sent(alert_id: int) -> None:
     """Update message_sent flag after successful Telegram send."""
+    mark_messages_sent([alert_id])
+
+
+def mark_messages_sent(alert_ids: list[Optional[int]]) -> None:
+    """Set message_sent for all given alerts with one UPDATE (None ids are skipped)."""
+    ids = [alert_id for alert_id in alert_ids if alert_id is not None]
     client = get_client()
-    if client is None or alert_id is None:
+    if client is None or not ids:
         return
     try:
         def _update():
             return (
                 client.table("alerts")
                 .update({"message_sent": True})
-                .eq("id", alert_id)
+                .in_("id", ids)
                 .execute()
             )
         _retry_db(_update)
     except Exception as exc:
-        logger.error("Failed to mark message_sent for id=%s: %s", alert_id, exc)
+        logger.error("Failed to mark message_sent for ids=%s: %s", ids, exc)
 
 
 def get_recent_alerts(limit: int = 10, asset: Optional[str] = None) -> list[dict]: